@@ -0,0 +1,39 @@
+import sys
+import os
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.strategy import MACrossoverStrategy
+from src.portfolio import Portfolio
+from src.price_block import PriceBlock
+
+# compares peak memory of the backtest pipeline with DataFrames vs PriceBlocks
+#   python benchmarks/bench_memory.py [rows]     (default 5,000,000 minute bars)
+
+def make_bars(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.0005, rows)))
+    index = pd.date_range('2020-01-01', periods=rows, freq='min')
+    return pd.DataFrame({'Open': close, 'High': close * 1.001, 'Low': close * 0.999,
+                         'Close': close, 'Volume': rng.integers(100, 10000, rows).astype(float)}, index=index)
+
+def peak_memory(make_input, rows):
+    raw = make_input(make_bars(rows))
+    tracemalloc.start()
+    # keep every stage alive , like main.py does
+    signals = MACrossoverStrategy(short_window=50, long_window=200).generate_signals(raw)
+    results = Portfolio(10000.0).backtest(signals)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000
+    input_mb = make_bars(rows).memory_usage(index=True).sum() / 1e6
+    frame_peak = peak_memory(lambda frame: frame, rows) / 1e6
+    block_peak = peak_memory(PriceBlock.from_frame, rows) / 1e6
+    print(f"rows: {rows:,}  input: {input_mb:,.1f} MB")
+    print(f"DataFrame pipeline peak:  {frame_peak:,.1f} MB ({frame_peak / input_mb:.2f}x input)")
+    print(f"PriceBlock pipeline peak: {block_peak:,.1f} MB ({block_peak / input_mb:.2f}x input)")
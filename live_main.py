@@ -1,11 +1,20 @@
 import os
+import time
+import asyncio
 import logging
 from datetime import datetime , timedelta
 from src.data_handler import DataHandler
 from src.strategy import MACrossoverStrategy
 from src.broker import AlpacaBroker
 from src.notifier import send_alert
+from src.journal import TradeJournal
+from src.checkpoint import RunCheckpoint
+from src.risk import RiskManager
+from src.profiling import profile_run, profile_thread, stage
+from src.trading_calendar import get_calendar
 
+# create a "logs" folder if doesnt already exist
+os.makedirs("logs", exist_ok=True)
 # dual logging , terminal and file
 logging.basicConfig(
     level=logging.INFO, 
@@ -14,67 +23,160 @@ logging.basicConfig(
     )
 logger = logging.getLogger(__name__)
 
+TICKER = 'SPY'
+CASH_BUFFER = 0.95
+MAX_DAILY_LOSS_PCT = -5.0
+JOURNAL_DIR = 'journal'
+CHECKPOINT_DIR = 'checkpoints'
+
+# risk settings , None turns a rule off (all None = all in / all out , same as before)
+TARGET_VOL = None           # e.g. 0.15 -> size entries for ~15% annualized volatility
+STOP_LOSS_PCT = None        # e.g. 8.0  -> exit once price is 8% below entry
+TRAILING_STOP_PCT = None    # e.g. 12.0 -> exit once price is 12% below its peak since entry
+MAX_DRAWDOWN_PCT = None     # e.g. 20.0 -> halt once the account is 20% below its 1-year peak
+
 def run_live_bot():
-    TICKER = 'SPY'
-    CASH_BUFFER = 0.95
-    MAX_DAILY_LOSS_PCT = -5.0
+    # everything the bot saw and did this run , written to the journal even if the run aborts
+    decision = {'action': 'none'}
+    started = time.perf_counter()
+    try:
+        _execute_live_run(decision)
+    except Exception as e:
+        decision['action'] = 'error'
+        decision['error'] = str(e)
+        raise
+    finally:
+        decision['total_ms'] = (time.perf_counter() - started) * 1000
+        _journal_decision(decision)
+
+# the journal must never take the bot down with it
+def _journal_decision(decision):
+    try:
+        with TradeJournal(JOURNAL_DIR) as journal:
+            journal.record_decision(TICKER, **decision)
+    except Exception as e:
+        logger.error(f"[!] Failed to write decision to journal: {e}")
+
+# same date + ticker + side always gives the same id , so the broker rejects a duplicate order
+def make_client_order_id(run_id , side):
+    return f"algotrad-{run_id}-{side}"
 
+def _execute_live_run(decision):
     # need at least 250 days (300 to be sure) to have 200 days worth of data
     end_date = datetime.today().strftime('%Y-%m-%d')
     start_date = (datetime.today() - timedelta(days=300)).strftime('%Y-%m-%d')
 
     logger.info(f"=== Waking up Live Bot for {TICKER} ===")
 
-    # initialize 
-    broker = AlpacaBroker()
-    handler = DataHandler(TICKER , start_date= start_date , end_date= end_date)
-    strategy = MACrossoverStrategy(short_window= 50 , long_window= 200)
+    # one run per day and ticker , a second run on the same day resumes from the checkpoint
+    run_id = f"{end_date}-{TICKER}"
+    decision['run_id'] = run_id
+    checkpoint = RunCheckpoint(CHECKPOINT_DIR, run_id).load()
+    if checkpoint.stage == 'completed':
+        logger.info(f"[*] Run {run_id} already completed. Nothing to do.")
+        decision['action'] = 'already_completed'
+        return
 
-    # fetch data and generate signals
-    raw_data = handler.fetch_data()
-    signals = strategy.generate_signals(raw_data)
-
-    # confirm we have enough recent data
-    last_data_date = signals.index[-1].date()
-    today = datetime.today().date()
-    days_gap = (today - last_data_date).days
-    # not enough data , for example public holidays
-    if days_gap > 5:
-        logger.error(f"[!] Data appears stale — last date is {last_data_date}. Aborting.")
+    # market data and broker state don't depend on each other , so fetch them concurrently
+    need_signals = checkpoint.get('target_signal') is None
+    signals, broker, snapshot = asyncio.run(_gather_inputs(decision, need_signals, start_date, end_date))
+
+    # a previous attempt crashed after saving the order intent , adopt that order instead of placing a new one
+    if checkpoint.stage == 'order_pending' and _recover_pending_order(broker, checkpoint, decision):
+        logger.info("=== Bot going back to sleep ===")
         return
-    # small data gap
-    if days_gap > 1:
-        logger.warning(f"[!] Possible holiday gap — last data date is {last_data_date}.")
-        
-    target_signal = signals['Signal'].iloc[-2]  # yesterdays confirmed signal
-    last_price = broker.get_last_price(TICKER)
+
+    # same risk rules as the backtest Portfolio
+    risk = RiskManager(target_vol=TARGET_VOL, stop_loss_pct=STOP_LOSS_PCT,
+                       trailing_stop_pct=TRAILING_STOP_PCT, max_drawdown_pct=MAX_DRAWDOWN_PCT)
+
+    if checkpoint.get('target_signal') is not None:
+        # signals were already computed today , no need to refetch
+        target_signal = checkpoint.get('target_signal')
+        target_weight = checkpoint.get('target_weight', target_signal)
+        stopped = checkpoint.get('stopped', False)
+        decision['last_data_date'] = checkpoint.get('last_data_date')
+        decision['last_close'] = checkpoint.get('last_close')
+        logger.info(f"[*] Using checkpointed signal from {checkpoint.get('last_data_date')}.")
+    else:
+        # confirm we have enough recent data , counted in trading sessions so weekends and holidays are not gaps
+        # the download's end date is exclusive , so the newest bar it can hold is the last session before end_date
+        last_data_date = signals.index[-1].date()
+        expected_date = get_calendar().last_completed_session(end_date)
+        missing_sessions = get_calendar().sessions_between(last_data_date, expected_date) - 1
+        decision['last_data_date'] = str(last_data_date)
+        decision['last_close'] = float(signals['Close'].iloc[-1])
+        # more than one completed session missing
+        if missing_sessions > 1:
+            logger.error(f"[!] Data appears stale — last date is {last_data_date}, {missing_sessions} sessions behind {expected_date}. Aborting.")
+            decision['action'] = 'abort_stale'
+            return
+        # one late bar from the data provider , trade on the previous one
+        if missing_sessions == 1:
+            logger.warning(f"[!] Latest session {expected_date} missing — last data date is {last_data_date}.")
+
+        target_signal = float(signals['Signal'].iloc[-2])  # yesterdays confirmed signal
+        # advance the stop state carried over from earlier runs to today's position size and stop flag
+        target_weight, stopped = _advance_risk(risk, signals, broker, snapshot[1])
+        checkpoint.save('signals', target_signal=target_signal, target_weight=target_weight, stopped=stopped,
+                        last_data_date=decision['last_data_date'], last_close=decision['last_close'])
+
+    last_price, current_shares, market_open, portfolio_value, initial_equity = snapshot
+    decision['signal'] = float(target_signal)
+    decision['target_weight'] = float(target_weight)
+    decision['stopped'] = bool(stopped)
+    decision['last_price'] = float(last_price)
 
     logger.info(f"[*] Current Price: ${last_price:.2f}")
     logger.info(f"[*] Target Signal: {'BUY/HOLD (1.0)' if target_signal == 1.0 else 'SELL/CASH (0.0)'}")
 
-    current_shares = broker.get_position(TICKER)
     logger.info(f"[*] Actual Shares Owned: {current_shares}")
+    decision['shares'] = float(current_shares)
 
     # algorithm is designed to trade when market is closed
-    if broker.is_market_open():
+    if market_open:
         logger.warning("[!] Market is currently open. Bot is designed to run after close. Skipping to avoid live execution.")
+        decision['action'] = 'skip_market_open'
         return
     
     # EMERGENCY EXIT — halt if daily loss exceeds 5%
-    portfolio_value = broker.get_portfolio_value()
-    initial_equity = broker.get_initial_equity()
     daily_loss_pct = ((portfolio_value - initial_equity) / initial_equity) * 100
+    decision['portfolio_value'] = float(portfolio_value)
+    decision['daily_pnl_pct'] = float(daily_loss_pct)
 
     if daily_loss_pct < MAX_DAILY_LOSS_PCT:
         logger.critical(f"[!!!] EMERGENCY EXIT TRIGGERED. Daily loss: {daily_loss_pct:.2f}%. Bot halting.")
         send_alert(f"EMERGENCY EXIT TRIGGERED. Daily loss: {daily_loss_pct:.2f}%. Bot has halted. Manual review required.")
+        decision['action'] = 'kill_switch'
         return
 
+    # DRAWDOWN LIMIT — halt if the account is too far below its peak
+    # like the backtest , exposure goes to zero after the breach: the position is sold and no new one is opened
+    if MAX_DRAWDOWN_PCT is not None:
+        risk.update_equity(broker.get_equity_peak())
+        if risk.update_equity(portfolio_value):
+            peak_equity = risk.peak_equity
+            logger.critical(f"[!!!] DRAWDOWN LIMIT HIT. Equity ${portfolio_value:,.2f} vs peak ${peak_equity:,.2f}. Bot halting.")
+            send_alert(f"DRAWDOWN LIMIT HIT. Equity ${portfolio_value:,.2f} vs peak ${peak_equity:,.2f}. Bot has halted. Manual review required.")
+            decision['action'] = 'drawdown_halt'
+            decision['halted'] = True
+            if current_shares > 0:
+                logger.info("[*] Liquidating the open position...")
+                order = _place_order(broker, checkpoint, decision, current_shares, 'sell')
+                if order:
+                    send_alert(f" ALGO ALERT: Drawdown halt SOLD {current_shares} shares of {TICKER} at ${last_price:.2f}!")
+            logger.info("=== Bot going back to sleep ===")
+            return
+
     if target_signal == 1.0 and current_shares == 0:
         
+        if stopped:
+            logger.info("[*] Stop already hit for this crossover. Waiting for a new signal before re-entering.")
+            decision['action'] = 'stopped_out'
         # if there is an open position ,  wait until it has gone through
-        if broker.has_open_trade(TICKER):
+        elif broker.has_open_trade(TICKER):
              logger.info("[*] Open order already exists . Skipping to avoid duplicate buy.")
+             decision['action'] = 'skip_open_order'
         else:
 
             logger.info("[*] MISMATCH: Strategy wants IN, but we are OUT. Buying...")
@@ -83,33 +185,141 @@ def run_live_bot():
             buying_power = broker.get_buying_power()
         
             # Leave a cash buffer to account for slippage/market fluctuations
-            investable_cash = buying_power * CASH_BUFFER
+            investable_cash = buying_power * CASH_BUFFER * target_weight
             qty = int(investable_cash // last_price)
         
             if qty > 0:
-                order = broker.submit_order(TICKER, qty, 'buy')
+                order = _place_order(broker, checkpoint, decision, qty, 'buy')
                 if order:
-                    broker.confirm_order(order.id)
                     send_alert(f" ALGO ALERT: Successfully BOUGHT {qty} shares of {TICKER} at ${last_price:.2f}!")
             else:
                 logger.warning("[!] Insufficient funds to buy 1 share.")
+                decision['action'] = 'insufficient_funds'
 
-    elif target_signal == 0.0 and current_shares > 0:
-        logger.info("[*] MISMATCH: Strategy wants OUT, but we are IN. Liquidating...")
-        order = broker.submit_order(TICKER, current_shares, 'sell')
+    elif current_shares > 0 and (target_signal == 0.0 or stopped):
+        if stopped:
+            logger.info("[*] STOP HIT: Price fell through the stop level. Liquidating...")
+        else:
+            logger.info("[*] MISMATCH: Strategy wants OUT, but we are IN. Liquidating...")
+        order = _place_order(broker, checkpoint, decision, current_shares, 'sell')
         if order:
-            broker.confirm_order(order.id)
             send_alert(f" ALGO ALERT: Successfully SOLD {current_shares} shares of {TICKER} at ${last_price:.2f}!")
     else:
         logger.info("[*] State is perfectly synced. No action required today.")
+        decision['action'] = 'hold'
+        checkpoint.save('completed')
         
     logger.info("=== Bot going back to sleep ===")
 
+# the stop state can't be rebuilt from the fetched history: the entry would be a made-up close from
+# a window that slides every day. So it is kept in a small state file and stepped forward one bar at a
+# time with RiskManager.update() , using the broker's average fill price as the entry.
+def _advance_risk(risk , signals , broker , current_shares):
+    state = RunCheckpoint(CHECKPOINT_DIR, f"risk-{TICKER}").load()
+    close = signals['Close'].to_numpy(dtype=float)
+    targets = signals['Signal'].shift(1).fillna(0).to_numpy()
+    last_date = state.get('last_date')
+    # bars not yet applied , only the latest one on the first run
+    if last_date is None:
+        new = signals.index == signals.index[-1]
+    else:
+        new = signals.index > last_date
+    if not new.any():
+        # same data as the last run (late bar) , the state is already up to date
+        return state.get('target_weight'), state.get('stopped')
+
+    # the history only warms up the volatility estimate for sizing
+    risk.prime(close[~new])
+    if last_date is not None:
+        risk.restore_position(state.get('position'))
+    if current_shares > 0 and risk.has_stops:
+        entry_price = broker.get_entry_price(TICKER)
+        if entry_price:
+            risk.set_entry_price(entry_price)
+    for price, target in zip(close[new], targets[new]):
+        target_weight = risk.update(price, target)
+
+    state.save('risk', last_date=str(signals.index[-1].date()), position=risk.position_state(),
+               target_weight=float(target_weight), stopped=bool(risk.stopped))
+    return float(target_weight), bool(risk.stopped)
+
+# runs the market data fetch alongside the broker connection and snapshot , returns once both are in
+async def _gather_inputs(decision , need_signals , start_date , end_date):
+    started = time.perf_counter()
+    if need_signals:
+        signals_task = asyncio.create_task(asyncio.to_thread(profile_thread(_fetch_signals), decision, start_date, end_date))
+    broker, snapshot = await _broker_snapshot(decision)
+    signals = await signals_task if need_signals else None
+    decision['inputs_ms'] = (time.perf_counter() - started) * 1000
+    return signals, broker, snapshot
+
+def _fetch_signals(decision , start_date , end_date):
+    handler = DataHandler(TICKER , start_date= start_date , end_date= end_date)
+    strategy = MACrossoverStrategy(short_window= 50 , long_window= 200)
+
+    # fetch data and generate signals
+    fetch_started = time.perf_counter()
+    with stage('fetch'):
+        raw_data = handler.fetch_data()
+    with stage('signal'):
+        signals = strategy.generate_signals(raw_data)
+    decision['fetch_ms'] = (time.perf_counter() - fetch_started) * 1000
+    return signals
+
+# snapshot of everything the decision needs from the broker , the independent calls run in parallel
+async def _broker_snapshot(decision):
+    with stage('broker'):
+        broker_started = time.perf_counter()
+        broker = await asyncio.to_thread(profile_thread(AlpacaBroker))
+        # both account values come from one cached account lookup , so read them in the same call
+        account_values = lambda: (broker.get_portfolio_value(), broker.get_initial_equity())
+        last_price, current_shares, market_open, (portfolio_value, initial_equity) = await asyncio.gather(
+            asyncio.to_thread(profile_thread(broker.get_last_price), TICKER),
+            asyncio.to_thread(profile_thread(broker.get_position), TICKER),
+            asyncio.to_thread(profile_thread(broker.is_market_open)),
+            asyncio.to_thread(profile_thread(account_values)),
+        )
+        decision['broker_ms'] = (time.perf_counter() - broker_started) * 1000
+    return broker, (last_price, current_shares, market_open, portfolio_value, initial_equity)
+
+# saves the order intent before submitting , so a crash at any point can be recovered
+def _place_order(broker , checkpoint , decision , qty , side):
+    client_order_id = make_client_order_id(checkpoint.run_id, side)
+    checkpoint.save('order_pending', side=side, qty=qty, client_order_id=client_order_id)
+    decision.update(action=side, qty=float(qty), client_order_id=client_order_id)
+
+    with stage('broker'):
+        order = broker.submit_order(TICKER, qty, side, client_order_id=client_order_id)
+        if order:
+            decision['order_id'] = str(order.id)
+            decision['order_status'] = str(broker.confirm_order(order.id))
+    if order:
+        checkpoint.save('completed', order_id=decision['order_id'], order_status=decision['order_status'])
+    return order
+
+# returns True if the order from a crashed attempt reached the broker and was adopted
+def _recover_pending_order(broker , checkpoint , decision):
+    client_order_id = checkpoint.get('client_order_id')
+    order = broker.get_order_by_client_id(client_order_id)
+    if order is None:
+        logger.warning(f"[!] Order {client_order_id} never reached the broker. Re-evaluating.")
+        return False
+
+    side = checkpoint.get('side')
+    qty = checkpoint.get('qty')
+    logger.info(f"[*] Found order {client_order_id} from a previous attempt. Confirming instead of resubmitting.")
+    decision.update(action=side, qty=float(qty), client_order_id=client_order_id, order_id=str(order.id))
+    decision['order_status'] = str(broker.confirm_order(order.id))
+    checkpoint.save('completed', order_id=decision['order_id'], order_status=decision['order_status'])
+    send_alert(f" ALGO ALERT: Recovered {side.upper()} order for {qty} shares of {TICKER} ({decision['order_status']}).")
+    return True
+
 
 
 
 if __name__ == "__main__":
     try:
-        run_live_bot()
+        with profile_run('live'):
+            run_live_bot()
     except Exception as e:
         logger.error(f"Live bot encountered a fatal error: {e}")
\ No newline at end of file
@@ -1,10 +1,15 @@
 import src.data_handler
 import src.strategy
 import src.portfolio
+import src.journal
+import src.result_cache
+from src.profiling import profile_run, stage
 import logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
 logger = logging.getLogger(__name__)
 
+RESULT_CACHE_DIR = 'cache'
+
 
 #main file that runs the trading algorithm
 
@@ -19,23 +24,41 @@ def run_algo():
     handler = src.data_handler.DataHandler(TICKER , START , END)
     strategy = src.strategy.MACrossoverStrategy()
     portfolio = src.portfolio.Portfolio(CASH)
+    # same data and settings as an earlier run -> results come from disk instead of being recomputed
+    cache = src.result_cache.ResultCache(RESULT_CACHE_DIR)
 
-    raw_data = handler.fetch_data()
-    signals = strategy.generate_signals(raw_data)
-    results = portfolio.backtest(signals)
+    with stage('fetch'):
+        raw_data = handler.fetch_block()
+    with stage('backtest'):
+        _, metrics = cache.backtest(raw_data, strategy, portfolio)
 
-    final_val = results['Total'].iloc[-1]
-    total_ret = ((final_val - CASH) / CASH) * 100
+    final_val = metrics['Final Value']
+    total_ret = metrics['Total Return %']
 
     logger.info("=" * 30)
     logger.info(f"FINAL PERFORMANCE: {TICKER}")
     logger.info(f"Ending Value:  ${final_val:,.2f}")
     logger.info(f"Total Return:  {total_ret:.2f}%")
+    logger.info(f"Max Drawdown:  {metrics['Max Drawdown %']:.2f}%")
     logger.info("=" * 30)
 
+    # keep the result , it vanishes when this function returns otherwise
+    # the journal is a side record , a failed write must not fail the backtest
+    try:
+        with src.journal.TradeJournal() as journal:
+            journal.record_backtest(TICKER, start=START, end=END,
+                                    strategy=type(strategy).__name__,
+                                    short_window=strategy.short_window, long_window=strategy.long_window,
+                                    initial_capital=CASH, fee_pct=portfolio.fee_pct,
+                                    final_value=final_val, total_return_pct=total_ret,
+                                    max_drawdown_pct=metrics['Max Drawdown %'], trades=metrics['Trades'])
+    except Exception as e:
+        logger.error(f"[!] Failed to write backtest to journal: {e}")
+
 if __name__ == "__main__":
     try:
-        run_algo()
-    except (ValueError, ConnectionError, KeyError) as e:
+        with profile_run('backtest'):
+            run_algo()
+    except (ValueError, ConnectionError, KeyError, OSError) as e:
         logger.error(f"Algo failed: {e}")
 
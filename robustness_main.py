@@ -0,0 +1,47 @@
+import src.data_handler
+import src.strategy
+import src.portfolio
+import src.montecarlo
+from src.profiling import profile_run, stage
+import logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+logger = logging.getLogger(__name__)
+
+
+#runs the strategy on thousands of resampled price paths to check how robust it is
+
+def run_robustness():
+    TICKER='SPY'
+    START = '2007-01-01'
+    END = '2011-12-31'
+    CASH = 10000.00
+    N_PATHS = 5000
+    METHOD = 'bootstrap'   # or 'synthetic'
+    N_WORKERS = 4
+
+    logger.info(f"Starting Monte Carlo Engine for {TICKER}")
+
+    handler = src.data_handler.DataHandler(TICKER , START , END)
+    strategy = src.strategy.MACrossoverStrategy()
+    portfolio = src.portfolio.Portfolio(CASH)
+    engine = src.montecarlo.MonteCarloEngine(strategy , portfolio , n_paths=N_PATHS , method=METHOD , n_workers=N_WORKERS)
+
+    with stage('fetch'):
+        raw_data = handler.fetch_block()
+    with stage('backtest'):
+        results = engine.run(raw_data)
+    summary = engine.summarize(results)
+
+    logger.info("=" * 30)
+    logger.info(f"ROBUSTNESS REPORT: {TICKER} ({N_PATHS} {METHOD} paths)")
+    for metric in summary.index:
+        row = summary.loc[metric]
+        logger.info(f"{metric:<15} 5%: {row['5%']:>8.2f}  median: {row['50%']:>8.2f}  95%: {row['95%']:>8.2f}")
+    logger.info("=" * 30)
+
+if __name__ == "__main__":
+    try:
+        with profile_run('robustness'):
+            run_robustness()
+    except (ValueError, ConnectionError, KeyError) as e:
+        logger.error(f"Robustness run failed: {e}")
@@ -3,6 +3,8 @@ import time
 import schedule
 import logging
 from live_main import run_live_bot
+from src.profiling import profile_run
+from src.trading_calendar import get_calendar, EXCHANGE_TZ
 import pytz
 from datetime import datetime
 
@@ -28,9 +30,16 @@ def get_utc_run_time():
     return utc_dt.strftime("%H:%M")
 
 def trading_job():
+    # the job fires Monday–Friday , exchange holidays are skipped here
+    exchange_date = datetime.now(pytz.timezone(EXCHANGE_TZ)).date()
+    if not get_calendar().is_session(exchange_date):
+        logger.info(f"[*] ALARM CLOCK: {exchange_date} is an exchange holiday. Staying asleep.")
+        return
     logger.info("[*] ALARM CLOCK: Waking up the trading bot...")
     try:
-        run_live_bot()
+        # same ALGO_PROFILE switch as running live_main.py by hand
+        with profile_run('live'):
+            run_live_bot()
     except Exception as e:
         logger.error(f"[!] Bot failed during scheduled run: {e}")
     logger.info("[*] ALARM CLOCK: Bot finished. Going back to sleep.")
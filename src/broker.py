@@ -3,12 +3,16 @@ import logging
 from dotenv import load_dotenv
 import alpaca_trade_api as tradeapi
 import time
+import threading
 
 logger = logging.getLogger(__name__)
 
 class AlpacaBroker:
 
-    def __init__(self):
+    # how long (seconds) a cached answer from each endpoint stays fresh
+    DEFAULT_CACHE_TTLS = {'account': 5.0, 'clock': 30.0, 'position': 5.0, 'history': 300.0}
+
+    def __init__(self , cache_ttls=None):
         load_dotenv()
         
         api_key = os.getenv("ALPACA_API_KEY")
@@ -20,14 +24,46 @@ class AlpacaBroker:
         
         self.api = tradeapi.REST(api_key , secret_key , base_url)
 
+        # read-through cache for account / clock / position queries
+        self.cache_ttls = {**self.DEFAULT_CACHE_TTLS, **(cache_ttls or {})}
+        self._cache = {}
+        # the live run reads several endpoints from worker threads at once
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
         self._validate_keys()
 
+    # returns a cached value if still fresh , otherwise calls fetch() and stores the result
+    def _cached(self , endpoint , key , fetch):
+        ttl = self.cache_ttls.get(endpoint, 0.0)
+        now = time.monotonic()
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is not None and now - entry[0] < ttl:
+                self.cache_hits += 1
+                return entry[1]
+            self.cache_misses += 1
+        # the network call runs outside the lock so different endpoints are still fetched in parallel
+        value = fetch()
+        with self._cache_lock:
+            self._cache[key] = (now, value)
+        return value
+
+    # drops every cached answer , called after any order event so decisions never use pre-order state
+    def invalidate_cache(self):
+        with self._cache_lock:
+            self._cache.clear()
+
+    def _get_account(self):
+        return self._cached('account', ('account',), self.api.get_account)
+
     # checks that api keys are valid
     def _validate_keys(self):
         logger.info("[*] Validating API keys with Alpaca...")
         try:
             # If the keys are bad, this specific line will trigger an exception
-            account = self.api.get_account()
+            account = self._get_account()
             logger.info(f"[*] Keys valid! Account Status: {account.status}")
         except Exception as e:
             # We use a PermissionError to clearly state it's an access issue
@@ -35,7 +71,7 @@ class AlpacaBroker:
 
     # get accounts buying power
     def get_buying_power(self):
-        account = self.api.get_account()
+        account = self._get_account()
         return float(account.buying_power)
     
     # get latest price of a ticker
@@ -49,13 +85,15 @@ class AlpacaBroker:
     
     # checks if market is currently open
     def is_market_open(self):
-        clock = self.api.get_clock()
+        clock = self._cached('clock', ('clock',), self.api.get_clock)
         return clock.is_open
     
     # checks if order has gone through
     def confirm_order(self , order_id ,wait_seconds=5):
         time.sleep(wait_seconds)
         order = self.api.get_order(order_id)
+        # fills change cash and positions
+        self.invalidate_cache()
         logger.info(f"[*] Order confirmation — Status: {order.status}")
         if order.status not in ['filled', 'partially_filled', 'accepted', 'pending_new']:
             logger.warning(f"[!] Order {order_id} has unexpected status: {order.status}")
@@ -63,17 +101,37 @@ class AlpacaBroker:
 
     # checks how much of 'ticker' the portfolio owns
     def get_position(self , ticker):
+        return self._get_position(ticker)[0]
+
+    # average fill price of the open position in 'ticker' , None if there is none
+    def get_entry_price(self , ticker):
+        return self._get_position(ticker)[1]
+
+    def _get_position(self , ticker):
+        return self._cached('position', ('position', ticker), lambda: self._fetch_position(ticker))
+
+    def _fetch_position(self , ticker):
         try:
             position = self.api.get_position(ticker)
-            return float(position.qty)
+            return float(position.qty), float(position.avg_entry_price)
         except tradeapi.rest.APIError as e:
             # Alpaca throws an error if you have 0 shares of a stock. We catch it and return 0.
             if 'does not exist' in str(e):
-                return 0.0
+                return 0.0, None
             raise e
         
+    # looks up an order by our own client order id , None if the broker never received it
+    def get_order_by_client_id(self , client_order_id):
+        try:
+            return self.api.get_order_by_client_order_id(client_order_id)
+        except tradeapi.rest.APIError as e:
+            if 'not found' in str(e).lower():
+                return None
+            raise e
+
     # executes live trade , buy or sell
-    def submit_order(self , ticker , quantity , side):
+    # Alpaca rejects a second order with the same client_order_id , which makes resubmits idempotent
+    def submit_order(self , ticker , quantity , side , client_order_id=None):
         logger.info(f"[*] Submitting {side.upper()} order for {quantity} shares of {ticker}...")
         try:
             order = self.api.submit_order(
@@ -81,20 +139,31 @@ class AlpacaBroker:
                 qty=quantity,
                 side=side,
                 type='market',
-                time_in_force='day' # if not comlpeted in the same day , reject it
+                time_in_force='day', # if not comlpeted in the same day , reject it
+                client_order_id=client_order_id
             )
             logger.info(f"[*] Order submitted successfully! Status: {order.status}")
             return order
         except Exception as e:
             logger.error(f"[!] Failed to submit order: {e}")
             return None
+        finally:
+            # even a failed submit may have reached the broker , so never trust pre-order state
+            self.invalidate_cache()
         
     # calculates portfolio value
     def get_portfolio_value(self):
-        account = self.api.get_account()
+        account = self._get_account()
         return float(account.portfolio_value)
     
+    # highest daily equity over the period , used for the drawdown limit
+    def get_equity_peak(self , period='1A'):
+        history = self._cached('history', ('history', period),
+                               lambda: self.api.get_portfolio_history(period=period, timeframe='1D'))
+        equity = [value for value in history.equity if value is not None]
+        return float(max(equity)) if equity else 0.0
+
     # equity at last days close
     def get_initial_equity(self):
-        account = self.api.get_account()
+        account = self._get_account()
         return float(account.last_equity)
\ No newline at end of file
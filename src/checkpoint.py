@@ -0,0 +1,45 @@
+import os
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# this class persists the progress of a single live run to disk
+# one small JSON file per run id , rewritten atomically after every stage so a crash
+# at any point leaves either the previous or the new checkpoint , never a half-written one
+
+class RunCheckpoint:
+
+    def __init__(self, directory, run_id):
+        self.directory = directory
+        self.run_id = run_id
+        self.path = os.path.join(directory, f"{run_id}.json")
+        self.state = {}
+
+    # reads an existing checkpoint for this run , if any
+    def load(self):
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                self.state = json.load(f)
+            logger.info(f"[*] Resuming run {self.run_id} from stage '{self.stage}'.")
+        return self
+
+    @property
+    def stage(self):
+        return self.state.get('stage')
+
+    def get(self, key, default=None):
+        return self.state.get(key, default)
+
+    # merges new fields into the checkpoint and writes it to disk
+    def save(self, stage, **fields):
+        self.state.update(fields)
+        self.state['stage'] = stage
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        # atomic on both POSIX and Windows
+        os.replace(tmp_path, self.path)
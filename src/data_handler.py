@@ -1,5 +1,8 @@
 import yfinance as yf
 import pandas as pd
+from src.profiling import stage
+from src.price_block import PriceBlock
+from src.trading_calendar import get_calendar
 
 #this class is responsible for fetching and processing historical price data
 
@@ -46,5 +49,19 @@ class DataHandler:
         print("[*] Data fetched successfully.")
 
         # clean data
-        clean_data = self._clean_data(data)
-        return clean_data
\ No newline at end of file
+        with stage('clean'):
+            clean_data = self._clean_data(data)
+            self._check_sessions(clean_data)
+        return clean_data
+
+    # warns if the data has fewer daily bars than the exchange had trading sessions
+    def _check_sessions(self , data):
+        if not isinstance(data.index, pd.DatetimeIndex) or data.empty:
+            return
+        expected = get_calendar().sessions_between(data.index[0], data.index[-1])
+        if len(data) < expected:
+            print(f"[!] WARNING: {expected - len(data)} of {expected} trading sessions missing for {self.ticker}.")
+
+    # same data as fetch_data , as an immutable column block that later stages extend without copying
+    def fetch_block(self):
+        return PriceBlock.from_frame(self.fetch_data())
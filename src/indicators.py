@@ -0,0 +1,292 @@
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+# indicator library , every indicator has two forms:
+#   batch(values)  -> vectorized over a whole series (1-D) or many series at once (2-D , along the last axis)
+#   update(value)  -> O(1) incremental step for bar-by-bar use , returns the latest value
+# both forms return NaN until the window is full and are checked against each other in the tests
+
+
+class Indicator(ABC):
+
+    def __init__(self, window):
+        if window < 1:
+            raise ValueError(f"[!] Indicator window must be at least 1, got {window}.")
+        self.window = window
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+
+    @abstractmethod
+    def update(self, value):
+        ...
+
+    @property
+    def ready(self):
+        return self.count >= self.window
+
+    # reference batch form , replays update() over the series
+    # subclasses override it with a vectorized version that must give the same numbers
+    def batch(self, values):
+        values = np.asarray(values, dtype=float)
+        if values.ndim == 2:
+            return np.vstack([self.batch(row) for row in values])
+        self.reset()
+        out = np.array([self.update(v) for v in values], dtype=float)
+        self.reset()
+        return out
+
+    # warms the incremental state up from history , returns the latest value
+    def prime(self, values):
+        self.reset()
+        value = math.nan
+        for v in values:
+            value = self.update(v)
+        return value
+
+
+class SMA(Indicator):
+    # a window of identical values averages to exactly that value (like pandas) , so flat
+    # stretches give exact ties between averages instead of rounding noise
+
+    def reset(self):
+        super().reset()
+        self._values = deque()
+        self._sum = 0.0
+        self._same = 0
+
+    def update(self, value):
+        self._same = self._same + 1 if self._values and value == self._values[-1] else 1
+        self._values.append(value)
+        self._sum += value
+        self.count += 1
+        if len(self._values) > self.window:
+            self._sum -= self._values.popleft()
+        # once per window recompute the sum exactly so rounding error can't build up (amortized O(1))
+        if self.count % self.window == 0:
+            self._sum = math.fsum(self._values)
+        if not self.ready:
+            return math.nan
+        return value if self._same >= self.window else self._sum / self.window
+
+    def batch(self, values):
+        # pandas keeps an O(n) running sum with compensated (Kahan) summation and applies the same
+        # flat-window rule , so it is exact on ties and stays accurate on multi-million bar series
+        values = np.asarray(values, dtype=float)
+        frame = pd.DataFrame(np.atleast_2d(values).T)
+        out = frame.rolling(self.window).mean().to_numpy().T
+        return out.reshape(values.shape)
+
+
+class EMA(Indicator):
+    # standard recursive EMA (alpha = 2 / (span + 1)) seeded with the first value
+
+    def __init__(self, window):
+        super().__init__(window)
+        self.alpha = 2.0 / (window + 1)
+
+    def reset(self):
+        super().reset()
+        self._ema = math.nan
+
+    def update(self, value):
+        self.count += 1
+        if self.count == 1:
+            self._ema = value
+        else:
+            self._ema += self.alpha * (value - self._ema)
+        return self._ema if self.ready else math.nan
+
+    def batch(self, values):
+        values = np.asarray(values, dtype=float)
+        frame = pd.DataFrame(np.atleast_2d(values).T)
+        out = frame.ewm(alpha=self.alpha, adjust=False, min_periods=self.window).mean().to_numpy().T
+        return out.reshape(values.shape)
+
+
+class WMA(Indicator):
+    # linearly weighted , newest value has weight `window` and oldest has weight 1
+
+    def __init__(self, window):
+        super().__init__(window)
+        self._divisor = window * (window + 1) / 2
+
+    def reset(self):
+        super().reset()
+        self._values = deque()
+        self._sum = 0.0
+        self._weighted_sum = 0.0
+
+    def update(self, value):
+        if len(self._values) == self.window:
+            # every weight drops by one , the oldest falls out and the new value takes the top weight
+            self._weighted_sum += self.window * value - self._sum
+            self._sum += value - self._values.popleft()
+        else:
+            self._weighted_sum += (len(self._values) + 1) * value
+            self._sum += value
+        self._values.append(value)
+        self.count += 1
+        return self._weighted_sum / self._divisor if self.ready else math.nan
+
+    def batch(self, values):
+        values = np.asarray(values, dtype=float)
+        out = np.full(values.shape, np.nan)
+        if values.shape[-1] >= self.window:
+            weights = np.arange(1, self.window + 1) / self._divisor
+            out[..., self.window - 1:] = sliding_window_view(values, self.window, axis=-1) @ weights
+        return out
+
+
+class RollingStd(Indicator):
+    # sample standard deviation (ddof=1 , same as pandas) using a sliding Welford update
+
+    def reset(self):
+        super().reset()
+        self._values = deque()
+        self.mean = math.nan
+        self._m2 = 0.0
+
+    def update(self, value):
+        self.count += 1
+        if len(self._values) == self.window:
+            old = self._values.popleft()
+            old_mean = self.mean
+            self.mean += (value - old) / self.window
+            self._m2 += (value - old) * (value - self.mean + old - old_mean)
+        elif not self._values:
+            self.mean = value
+            self._m2 = 0.0
+        else:
+            delta = value - self.mean
+            self.mean += delta / (len(self._values) + 1)
+            self._m2 += delta * (value - self.mean)
+        self._values.append(value)
+        # once per window recompute the moments exactly so rounding error can't build up (amortized O(1))
+        if self.count % self.window == 0:
+            self.mean = math.fsum(self._values) / len(self._values)
+            self._m2 = math.fsum((v - self.mean) ** 2 for v in self._values)
+        if not self.ready or self.window < 2:
+            return math.nan
+        return math.sqrt(max(self._m2, 0.0) / (self.window - 1))
+
+    def batch(self, values):
+        values = np.asarray(values, dtype=float)
+        out = np.full(values.shape, np.nan)
+        if values.shape[-1] >= self.window and self.window > 1:
+            out[..., self.window - 1:] = sliding_window_view(values, self.window, axis=-1).std(axis=-1, ddof=1)
+        return out
+
+
+class ZScore(Indicator):
+    # distance of the latest value from its rolling mean , in rolling standard deviations
+
+    def reset(self):
+        super().reset()
+        self._std = RollingStd(self.window)
+
+    def update(self, value):
+        self.count += 1
+        std = self._std.update(value)
+        return (value - self._std.mean) / std if self.ready and std > 0 else math.nan
+
+    def batch(self, values):
+        values = np.asarray(values, dtype=float)
+        std = RollingStd(self.window).batch(values)
+        mean = SMA(self.window).batch(values)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(std > 0, (values - mean) / std, np.nan)
+
+
+class RollingMax(Indicator):
+    # monotonic deque of (index , value) , the front is always the current maximum
+
+    def _beats(self, new, old):
+        return new >= old
+
+    def reset(self):
+        super().reset()
+        self._deque = deque()
+
+    def update(self, value):
+        while self._deque and self._beats(value, self._deque[-1][1]):
+            self._deque.pop()
+        self._deque.append((self.count, value))
+        if self._deque[0][0] <= self.count - self.window:
+            self._deque.popleft()
+        self.count += 1
+        return self._deque[0][1] if self.ready else math.nan
+
+    def _reduce(self, windows):
+        return windows.max(axis=-1)
+
+    def batch(self, values):
+        values = np.asarray(values, dtype=float)
+        out = np.full(values.shape, np.nan)
+        if values.shape[-1] >= self.window:
+            out[..., self.window - 1:] = self._reduce(sliding_window_view(values, self.window, axis=-1))
+        return out
+
+
+class RollingMin(RollingMax):
+
+    def _beats(self, new, old):
+        return new <= old
+
+    def _reduce(self, windows):
+        return windows.min(axis=-1)
+
+
+class ATR(Indicator):
+    # Wilder's average true range , seeded with the simple mean of the first `window` true ranges
+    # takes (high , low , close) instead of a single value
+
+    def reset(self):
+        super().reset()
+        self._prev_close = math.nan
+        self._atr = 0.0
+
+    def update(self, high, low, close):
+        if self.count == 0:
+            true_range = high - low
+        else:
+            true_range = max(high - low, abs(high - self._prev_close), abs(low - self._prev_close))
+        self._prev_close = close
+        self.count += 1
+        if self.count <= self.window:
+            self._atr += true_range / self.window
+        else:
+            self._atr += (true_range - self._atr) / self.window
+        return self._atr if self.ready else math.nan
+
+    def prime(self, high, low, close):
+        self.reset()
+        value = math.nan
+        for h, l, c in zip(high, low, close):
+            value = self.update(h, l, c)
+        return value
+
+    def batch(self, high, low, close):
+        high, low, close = (np.asarray(a, dtype=float) for a in (high, low, close))
+        prev_close = np.concatenate([close[..., :1], close[..., :-1]], axis=-1)
+        true_range = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+        true_range[..., 0] = high[..., 0] - low[..., 0]
+
+        out = np.full(true_range.shape, np.nan)
+        if true_range.shape[-1] < self.window:
+            return out
+        # Wilder smoothing is an EMA with alpha = 1 / window , started from the seed value
+        seed = true_range[..., :self.window].mean(axis=-1)
+        tail = np.concatenate([seed[..., None], true_range[..., self.window:]], axis=-1)
+        frame = pd.DataFrame(np.atleast_2d(tail).T)
+        smoothed = frame.ewm(alpha=1.0 / self.window, adjust=False).mean().to_numpy().T
+        out[..., self.window - 1:] = smoothed.reshape(tail.shape)
+        return out
+
+
+MOVING_AVERAGES = {'sma': SMA, 'ema': EMA, 'wma': WMA}
@@ -0,0 +1,122 @@
+import os
+import uuid
+import logging
+from datetime import datetime, timezone
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# this class is an append-only journal of live decisions and backtest results
+# records are buffered in memory and written in batches as immutable parquet files,
+# partitioned by table / symbol / date so queries only open the files they need
+#
+#   journal/decisions/symbol=SPY/date=2026-02-23/part-<time>-<id>.parquet
+
+class TradeJournal:
+
+    TABLES = ('decisions', 'backtests')
+
+    def __init__(self, root='journal', batch_size=100):
+        self.root = root
+        self.batch_size = batch_size
+        self._buffers = {table: [] for table in self.TABLES}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+
+    # one record per live run: signal, prices, positions, orders and latencies
+    def record_decision(self, symbol, **fields):
+        self._append('decisions', symbol, fields)
+
+    # one record per backtest: settings and final performance
+    def record_backtest(self, symbol, **fields):
+        self._append('backtests', symbol, fields)
+
+    def _append(self, table, symbol, fields):
+        now = datetime.now(timezone.utc)
+        record = {'timestamp': now, 'date': now.strftime('%Y-%m-%d'), 'symbol': symbol}
+        record.update(fields)
+        self._buffers[table].append(record)
+        if len(self._buffers[table]) >= self.batch_size:
+            self._flush_table(table)
+
+    # writes every buffered record to disk
+    def flush(self):
+        for table in self.TABLES:
+            self._flush_table(table)
+
+    def _flush_table(self, table):
+        records = self._buffers[table]
+        if not records:
+            return
+        self._buffers[table] = []
+        batch = pd.DataFrame(records)
+        stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')
+        for (symbol, date), group in batch.groupby(['symbol', 'date']):
+            folder = os.path.join(self.root, table, f"symbol={symbol}", f"date={date}")
+            os.makedirs(folder, exist_ok=True)
+            # a new file per batch , existing files are never rewritten
+            path = os.path.join(folder, f"part-{stamp}-{uuid.uuid4().hex[:8]}.parquet")
+            group.reset_index(drop=True).to_parquet(path, index=False)
+        logger.info(f"[*] Journal: wrote {len(records)} {table} record(s).")
+
+    # merges the part files of every partition of a table into one file per partition
+    # a live run writes one tiny file per run , so run this now and then (not while another process writes)
+    def compact(self, table, symbol=None):
+        if table not in self.TABLES:
+            raise ValueError(f"[!] Unknown journal table '{table}'. Use one of {self.TABLES}.")
+
+        merged = 0
+        table_dir = os.path.join(self.root, table)
+        symbols = [symbol] if symbol else self._partitions(table_dir, 'symbol')
+        for sym in symbols:
+            symbol_dir = os.path.join(table_dir, f"symbol={sym}")
+            for date in self._partitions(symbol_dir, 'date'):
+                date_dir = os.path.join(symbol_dir, f"date={date}")
+                parts = [os.path.join(date_dir, f) for f in sorted(os.listdir(date_dir)) if f.endswith('.parquet')]
+                if len(parts) < 2:
+                    continue
+                data = pd.concat([pd.read_parquet(f) for f in parts], ignore_index=True)
+                data = data.sort_values('timestamp').reset_index(drop=True)
+                stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')
+                path = os.path.join(date_dir, f"part-{stamp}-{uuid.uuid4().hex[:8]}.parquet")
+                # queries only read *.parquet , so the merged file appears in one step
+                data.to_parquet(f"{path}.tmp", index=False)
+                os.replace(f"{path}.tmp", path)
+                for f in parts:
+                    os.remove(f)
+                merged += len(parts)
+        logger.info(f"[*] Journal: compacted {merged} {table} file(s).")
+        return merged
+
+    # loads records for a table , filtered by symbol and inclusive date range ('YYYY-MM-DD')
+    def query(self, table, start=None, end=None, symbol=None):
+        if table not in self.TABLES:
+            raise ValueError(f"[!] Unknown journal table '{table}'. Use one of {self.TABLES}.")
+
+        files = []
+        table_dir = os.path.join(self.root, table)
+        symbols = [symbol] if symbol else self._partitions(table_dir, 'symbol')
+        for sym in symbols:
+            symbol_dir = os.path.join(table_dir, f"symbol={sym}")
+            for date in self._partitions(symbol_dir, 'date'):
+                # prune whole partitions by their folder name before reading anything
+                if (start and date < start) or (end and date > end):
+                    continue
+                date_dir = os.path.join(symbol_dir, f"date={date}")
+                files.extend(os.path.join(date_dir, f) for f in sorted(os.listdir(date_dir)) if f.endswith('.parquet'))
+
+        if not files:
+            return pd.DataFrame()
+        data = pd.concat([pd.read_parquet(f) for f in files], ignore_index=True)
+        return data.sort_values('timestamp').reset_index(drop=True)
+
+    @staticmethod
+    def _partitions(folder, key):
+        if not os.path.isdir(folder):
+            return []
+        prefix = f"{key}="
+        return sorted(name[len(prefix):] for name in os.listdir(folder) if name.startswith(prefix))
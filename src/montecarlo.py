@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from src.indicators import MOVING_AVERAGES
+
+# this class stress-tests the MA crossover strategy on thousands of resampled price paths
+# paths are simulated as 2-D arrays (paths x days) in chunks , optionally across processes
+
+
+def _batched_backtest(prices, short_window, long_window, initial_capital, fee_pct, ma_type='sma'):
+    # crossover signals for every path at once , NaN comparisons count as 0.0 (OUT)
+    moving_average = MOVING_AVERAGES[ma_type]
+    signals = (moving_average(short_window).batch(prices) > moving_average(long_window).batch(prices)).astype(float)
+    # shift by one day to prevent lookahead , first day has no signal
+    targets = np.zeros_like(signals)
+    targets[:, 1:] = signals[:, :-1]
+
+    n_paths, n_days = prices.shape
+    cash = np.full(n_paths, float(initial_capital))
+    shares = np.zeros(n_paths)
+    trades = np.zeros(n_paths, dtype=int)
+    peak = cash.copy()
+    max_drawdown = np.zeros(n_paths)
+
+    # same ledger as Portfolio.backtest , but each step updates all paths together
+    for i in range(n_days):
+        price = prices[:, i]
+        target = targets[:, i]
+
+        buy = (target == 1.0) & (shares == 0.0)
+        fee = cash[buy] * fee_pct
+        shares[buy] = (cash[buy] - fee) / price[buy]
+        cash[buy] = 0.0
+
+        sell = (target == 0.0) & (shares > 0.0)
+        gross_proceeds = shares[sell] * price[sell]
+        fee = gross_proceeds * fee_pct
+        cash[sell] = gross_proceeds - fee
+        shares[sell] = 0.0
+
+        trades += buy | sell
+        total = cash + shares * price
+        np.maximum(peak, total, out=peak)
+        np.minimum(max_drawdown, total / peak - 1.0, out=max_drawdown)
+
+    return pd.DataFrame({
+        'Total Return %': (total - initial_capital) / initial_capital * 100,
+        'Max Drawdown %': max_drawdown * 100,
+        'Trades': trades,
+    })
+
+
+def _generate_paths(log_returns, start_price, n_paths, n_days, method, block_size, rng):
+    n_steps = n_days - 1
+    if method == 'bootstrap':
+        # circular block bootstrap keeps short-term autocorrelation inside each block
+        n_blocks = -(-n_steps // block_size)
+        starts = rng.integers(0, len(log_returns), size=(n_paths, n_blocks))
+        idx = (starts[:, :, None] + np.arange(block_size)) % len(log_returns)
+        steps = log_returns[idx.reshape(n_paths, -1)[:, :n_steps]]
+    else:
+        # geometric brownian motion with the historical drift and volatility
+        steps = rng.normal(log_returns.mean(), log_returns.std(), size=(n_paths, n_steps))
+
+    log_paths = np.zeros((n_paths, n_days))
+    np.cumsum(steps, axis=1, out=log_paths[:, 1:])
+    return start_price * np.exp(log_paths)
+
+
+def _simulate_chunk(args):
+    (log_returns, start_price, n_paths, n_days, method, block_size,
+     seed, short_window, long_window, ma_type, initial_capital, fee_pct) = args
+    rng = np.random.default_rng(seed)
+    prices = _generate_paths(log_returns, start_price, n_paths, n_days, method, block_size, rng)
+    return _batched_backtest(prices, short_window, long_window, initial_capital, fee_pct, ma_type)
+
+
+class MonteCarloEngine:
+
+    METHODS = ('bootstrap', 'synthetic')
+
+    def __init__(self, strategy, portfolio, n_paths=1000, method='bootstrap', block_size=20,
+                 chunk_size=250, n_workers=1, seed=None):
+        # check for valid parameters
+        if method not in self.METHODS:
+            raise ValueError(f"[!] Unknown resampling method '{method}'. Use one of {self.METHODS}.")
+        if n_paths <= 0 or chunk_size <= 0 or block_size <= 0:
+            raise ValueError("[!] n_paths, chunk_size and block_size must be positive.")
+        # the batched ledger is all in / all out , it would silently drop stops and sizing
+        if portfolio.risk is not None:
+            raise ValueError("[!] MONTE CARLO ERROR: Risk rules (portfolio.risk) are not supported. Use a Portfolio without a RiskManager.")
+
+        self.strategy = strategy
+        self.portfolio = portfolio
+        self.n_paths = n_paths
+        self.method = method
+        self.block_size = block_size
+        self.chunk_size = chunk_size
+        self.n_workers = n_workers
+        self.seed = seed
+
+    def _chunk_args(self, data):
+        close = np.asarray(data['Close'], dtype=float)
+        log_returns = np.diff(np.log(close))
+        # one independent seed per chunk , results don't depend on the number of workers
+        chunk_sizes = [min(self.chunk_size, self.n_paths - start) for start in range(0, self.n_paths, self.chunk_size)]
+        seeds = np.random.SeedSequence(self.seed).spawn(len(chunk_sizes))
+        return [
+            (log_returns, close[0], size, len(close), self.method, self.block_size, seed,
+             self.strategy.short_window, self.strategy.long_window, self.strategy.ma_type,
+             self.portfolio.initial_capital, self.portfolio.fee_pct)
+            for size, seed in zip(chunk_sizes, seeds)
+        ]
+
+    def run(self, data):
+        print(f"[*] Simulating {self.n_paths} {self.method} paths in chunks of {self.chunk_size}...")
+        # check for needed columns
+        if 'Close' not in data.columns:
+            raise ValueError("[!] MONTE CARLO ERROR: Missing required column 'Close'.")
+        if len(data) <= self.strategy.long_window:
+            raise ValueError(f"[!] MONTE CARLO ERROR: Need more than {self.strategy.long_window} days of data.")
+
+        chunks = self._chunk_args(data)
+        if self.n_workers == 1:
+            results = [_simulate_chunk(args) for args in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers=self.n_workers) as pool:
+                results = list(pool.map(_simulate_chunk, chunks))
+
+        self.results = pd.concat(results, ignore_index=True)
+        print("[*] Monte Carlo simulation complete.")
+        return self.results
+
+    @staticmethod
+    def summarize(results):
+        # distribution of each metric across all simulated paths
+        return results.describe(percentiles=[0.05, 0.25, 0.5, 0.75, 0.95]).T
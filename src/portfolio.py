@@ -1,67 +1,98 @@
+import numpy as np
 import pandas as pd
+from src.price_block import add_columns
 
 class Portfolio:
     """
     Simulates a realistic brokerage account using an event-driven ledger.
     Tracks exact cash, dynamic share counts, and transaction fees.
+    An optional RiskManager sizes entries and applies stops and drawdown limits.
+    Accepts a DataFrame or a PriceBlock and returns the same type with the ledger columns added.
     """
-    def __init__(self, initial_capital=10000.0):
+    def __init__(self, initial_capital=10000.0, fee_pct=0.001, risk=None):
         self.initial_capital = initial_capital
+        self.fee_pct = fee_pct
+        self.risk = risk
+
+    def _ledger(self, prices, exposure):
+        # cash and shares only change on the bars where the target exposure changes,
+        # so the ledger steps through trades instead of through every day
+        cash = self.initial_capital
+        shares = 0.0
+        fee_pct = self.fee_pct
+
+        previous = np.concatenate([[0.0], exposure[:-1]])
+        events = np.flatnonzero((exposure > 0) != (previous > 0))
+        cash_after = np.empty(len(events))
+        shares_after = np.empty(len(events))
+
+        for k, i in enumerate(events):
+            price = prices[i]
+
+            # State Mismatch: Strategy wants IN, but we are OUT. -> BUY (a fraction of cash if sized)
+            if exposure[i] > 0 and shares == 0.0:
+                invested = cash * exposure[i]
+                fee = invested * fee_pct
+                shares = (invested - fee) / price
+                cash = cash - invested
+
+            # State Mismatch: Strategy wants OUT, but we are IN. -> SELL
+            elif exposure[i] == 0 and shares > 0.0:
+                gross_proceeds = shares * price
+                fee = gross_proceeds * fee_pct
+                cash = cash + gross_proceeds - fee
+                shares = 0.0
+
+            cash_after[k] = cash
+            shares_after[k] = shares
+
+        # --- RECORD DAILY LEDGER --- (hold the state of the latest trade on every day)
+        last_event = np.searchsorted(events, np.arange(len(prices)), side='right') - 1
+        traded = last_event >= 0
+        cash_history = np.where(traded, cash_after[last_event], self.initial_capital)
+        shares_history = np.where(traded, shares_after[last_event], 0.0)
+        return cash_history, shares_history
 
     def backtest(self, data):
         print("[*] Running robust state-based portfolio simulation...")
-        
+
         # check for required columns
         required_columns = ['Close', 'Signal']
         for col in required_columns:
             if col not in data.columns:
                 raise KeyError(f"[!] PORTFOLIO ERROR: Missing required column '{col}'. Check your Strategy output.")
-        data = data.copy()
 
-        cash = self.initial_capital
-        shares = 0.0
-        fee_pct = 0.001
-        
-        cash_history = []
-        shares_history = []
-        total_history = []
-        
-        prices = data['Close'].values
-        target_signals = data['Signal'].shift(1).fillna(0).values 
-        
-        for i in range(len(prices)):
-            price = prices[i]
-            target = target_signals[i]
-            
-            # --- TARGET PORTFOLIO SYNCING ---
-            
-            # State Mismatch: Strategy wants IN, but we are OUT. -> BUY
-            if target == 1.0 and shares == 0.0:
-                fee = cash * fee_pct
-                available_cash = cash - fee
-                shares = available_cash / price
-                cash = 0.0
-                
-            # State Mismatch: Strategy wants OUT, but we are IN. -> SELL
-            elif target == 0.0 and shares > 0.0:
-                gross_proceeds = shares * price
-                fee = gross_proceeds * fee_pct
-                cash = gross_proceeds - fee
-                shares = 0.0
-                
-            # If target == 1.0 and shares > 0 (We are IN and should be IN) -> DO NOTHING
-            # If target == 0.0 and shares == 0 (We are OUT and should be OUT) -> DO NOTHING
-                
-            # --- RECORD DAILY LEDGER ---
-            cash_history.append(cash)
-            shares_history.append(shares)
-            total_history.append(cash + (shares * price))
-            
-        data['Cash'] = cash_history
-        data['Shares'] = shares_history
-        data['Total'] = total_history
-        
-        self.positions = data
+        prices = np.asarray(data['Close'], dtype=float)
+        signals = np.asarray(data['Signal'], dtype=float)
+        # shift by one day to prevent lookahead , missing signals mean OUT
+        target_signals = np.zeros(len(signals))
+        target_signals[1:] = np.nan_to_num(signals[:-1], nan=0.0)
+
+        columns = {}
+        if self.risk is None:
+            # all in or all out
+            exposure = target_signals
+        else:
+            risk = self.risk.apply(prices, target_signals)
+            exposure = risk['Exposure'].to_numpy()
+            columns['Stopped'] = risk['Stopped'].to_numpy()
+
+        cash_history, shares_history = self._ledger(prices, exposure)
+
+        # drawdown limit: everything before the breach is unchanged , so cut exposure after it and replay
+        if self.risk is not None:
+            halt = self.risk.halt_index(cash_history + shares_history * prices)
+            if halt is not None and halt < len(prices):
+                print(f"[!] Drawdown limit hit on {data.index[halt - 1]}. Trading halted.")
+                exposure = exposure.copy()
+                exposure[halt:] = 0.0
+                cash_history, shares_history = self._ledger(prices, exposure)
+            columns['Exposure'] = exposure
+
+        columns['Cash'] = cash_history
+        columns['Shares'] = shares_history
+        columns['Total'] = cash_history + shares_history * prices
+
+        self.positions = add_columns(data, columns)
         print("[*] Backtest complete.")
         return self.positions
-
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+# this class is an immutable , column-oriented block of price data (a struct of numpy arrays)
+# it is passed between DataHandler , strategies and Portfolio instead of a DataFrame:
+# every stage reads the columns it needs and returns a new block that shares all existing
+# arrays and only adds its own output columns , so nothing is copied from stage to stage
+
+class PriceBlock:
+
+    def __init__(self, index, columns):
+        self.index = index
+        self._columns = {}
+        for name, values in columns.items():
+            values = np.asarray(values)
+            if len(values) != len(index):
+                raise ValueError(f"[!] PRICE BLOCK ERROR: Column '{name}' has {len(values)} rows, expected {len(index)}.")
+            # read-only view , the underlying memory is shared and never copied
+            view = values.view()
+            view.flags.writeable = False
+            self._columns[name] = view
+
+    # takes the columns straight out of a DataFrame , as views where pandas allows it
+    @classmethod
+    def from_frame(cls, frame):
+        return cls(frame.index, {name: frame[name].to_numpy() for name in frame.columns})
+
+    @property
+    def columns(self):
+        return list(self._columns)
+
+    def __contains__(self, name):
+        return name in self._columns
+
+    def __getitem__(self, name):
+        return self._columns[name]
+
+    def __len__(self):
+        return len(self.index)
+
+    # a new block with extra columns , existing arrays are shared , not copied
+    def with_columns(self, **columns):
+        return PriceBlock(self.index, {**self._columns, **columns})
+
+    # copies into a DataFrame , for display or code that still needs pandas
+    def to_frame(self):
+        return pd.DataFrame(dict(self._columns), index=self.index)
+
+
+# returns `data` with extra columns: a new PriceBlock sharing its arrays , or a copied DataFrame
+def add_columns(data, columns):
+    if isinstance(data, PriceBlock):
+        return data.with_columns(**columns)
+    data = data.copy()
+    for name, values in columns.items():
+        data[name] = values
+    return data
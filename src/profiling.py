@@ -0,0 +1,196 @@
+import os
+import sys
+import time
+import cProfile
+import pstats
+import functools
+import logging
+import threading
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# opt-in profiling for backtest and live runs , turned on with an environment variable:
+#
+#   ALGO_PROFILE=cprofile        -> <run>.prof (open with snakeviz / pstats)
+#   ALGO_PROFILE=sample          -> <run>.folded collapsed stacks (flamegraph.pl , speedscope , inferno)
+#   ALGO_PROFILE=memory          -> tracemalloc peak and top allocations per pipeline stage
+#   ALGO_PROFILE=sample,memory   -> modes can be combined
+#
+# files go to ALGO_PROFILE_DIR (default 'profiles'). When ALGO_PROFILE is unset profile_run()
+# and stage() hand back a shared no-op context , so the instrumented code pays one global lookup.
+
+MODES = ('cprofile', 'sample', 'memory')
+_NULL = nullcontext()
+_active = None
+
+
+class _Sampler(threading.Thread):
+    # samples the stacks of all threads at a fixed interval and counts identical stacks
+
+    def __init__(self, profiler, interval):
+        super().__init__(daemon=True)
+        self.profiler = profiler
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == self.ident:
+                    continue
+                names = []
+                while frame is not None:
+                    code = frame.f_code
+                    names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                # root first , with the thread's current pipeline stage as the outermost frame
+                names.reverse()
+                stage = self.profiler.current_stage_of(thread_id)
+                if stage:
+                    names.insert(0, f"stage:{stage}")
+                self.stacks[';'.join(names)] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class Profiler:
+
+    def __init__(self, name, modes, output_dir='profiles', interval=0.005):
+        unknown = set(modes) - set(MODES)
+        if unknown:
+            raise ValueError(f"[!] Unknown profiling mode(s) {sorted(unknown)}. Use any of {MODES}.")
+        self.name = name
+        self.modes = set(modes)
+        self.output_dir = output_dir
+        self.interval = interval
+        self.stages = []
+        # cProfile only sees the thread that enabled it , worker threads get their own (see profile_thread)
+        self._thread_profiles = []
+        self._lock = threading.Lock()
+        # stages can run at the same time in different threads (async live run) , one stack per thread
+        self._stacks = {}
+        self._prefix = os.path.join(output_dir, f"{name}-{datetime.now():%Y%m%dT%H%M%S}")
+
+    def current_stage_of(self, thread_id):
+        # copy first , the sampler thread reads stacks while other threads change them
+        return '/'.join(entry['name'] for entry in list(self._stacks.get(thread_id, [])))
+
+    def __enter__(self):
+        global _active
+        os.makedirs(self.output_dir, exist_ok=True)
+        if 'memory' in self.modes:
+            tracemalloc.start()
+        if 'cprofile' in self.modes:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        if 'sample' in self.modes:
+            self._sampler = _Sampler(self, self.interval)
+            self._sampler.start()
+        self._started = time.perf_counter()
+        _active = self
+        logger.info(f"[*] Profiling '{self.name}' ({', '.join(sorted(self.modes))}).")
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        global _active
+        _active = None
+        elapsed = time.perf_counter() - self._started
+        if 'sample' in self.modes:
+            self._sampler.stop()
+            with open(f"{self._prefix}.folded", 'w') as f:
+                for stack, count in sorted(self._sampler.stacks.items()):
+                    f.write(f"{stack} {count}\n")
+        if 'cprofile' in self.modes:
+            self._cprofile.disable()
+            stats = pstats.Stats(self._cprofile)
+            with self._lock:
+                for profile in self._thread_profiles:
+                    stats.add(profile)
+            stats.dump_stats(f"{self._prefix}.prof")
+        if 'memory' in self.modes:
+            tracemalloc.stop()
+        self._write_stage_report(elapsed)
+        logger.info(f"[*] Profile written to {self._prefix}.*")
+
+    # runs func with its own cProfile , merged into the run's .prof on exit
+    def _profile_call(self, func, args, kwargs):
+        profile = cProfile.Profile()
+        try:
+            return profile.runcall(func, *args, **kwargs)
+        finally:
+            profile.create_stats()
+            with self._lock:
+                self._thread_profiles.append(profile)
+
+    @contextmanager
+    def stage(self, name):
+        entry = {'name': name, 'child_peak': 0}
+        if 'memory' in self.modes:
+            tracemalloc.reset_peak()
+            entry['snapshot'] = tracemalloc.take_snapshot()
+            entry['start_memory'] = tracemalloc.get_traced_memory()[0]
+        thread_id = threading.get_ident()
+        stack = self._stacks.setdefault(thread_id, [])
+        stack.append(entry)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            record = {'stage': self.current_stage_of(thread_id), 'seconds': time.perf_counter() - started}
+            stack.pop()
+            if 'memory' in self.modes:
+                # memory is process-wide , so peaks are approximate while stages overlap in threads
+                current, peak = tracemalloc.get_traced_memory()
+                # a nested stage resets the peak counter , so fold its peak back in
+                peak = max(peak, entry['child_peak'])
+                if stack:
+                    stack[-1]['child_peak'] = max(stack[-1]['child_peak'], peak)
+                top = tracemalloc.take_snapshot().compare_to(entry['snapshot'], 'lineno')[:5]
+                record.update(net_bytes=current - entry['start_memory'], peak_bytes=peak,
+                              top_allocations=[str(stat) for stat in top])
+            self.stages.append(record)
+
+    def _write_stage_report(self, elapsed):
+        with open(f"{self._prefix}-stages.txt", 'w') as f:
+            f.write(f"run: {self.name}  total: {elapsed:.3f}s\n")
+            for record in self.stages:
+                line = f"{record['stage']:<24} {record['seconds']:>9.3f}s"
+                if 'peak_bytes' in record:
+                    line += f"  net {record['net_bytes'] / 1e6:>9.2f} MB  peak {record['peak_bytes'] / 1e6:>9.2f} MB"
+                f.write(line + '\n')
+                for stat in record.get('top_allocations', []):
+                    f.write(f"    {stat}\n")
+
+
+# wraps a whole run , profiling only if ALGO_PROFILE is set
+def profile_run(name):
+    modes = [m.strip() for m in os.getenv("ALGO_PROFILE", "").split(',') if m.strip()]
+    if not modes:
+        return _NULL
+    return Profiler(name, modes, output_dir=os.getenv("ALGO_PROFILE_DIR", "profiles"))
+
+
+# wraps a function that will run in a worker thread (asyncio.to_thread , executors) so cProfile
+# records it too , cProfile itself only follows the thread that started the run
+def profile_thread(func):
+    @functools.wraps(func)
+    def call(*args, **kwargs):
+        profiler = _active
+        if profiler is None or 'cprofile' not in profiler.modes:
+            return func(*args, **kwargs)
+        return profiler._profile_call(func, args, kwargs)
+    return call
+
+
+# marks a pipeline stage (fetch , clean , signal , backtest , broker) inside a profiled run
+def stage(name):
+    if _active is None:
+        return _NULL
+    return _active.stage(name)
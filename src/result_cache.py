@@ -0,0 +1,171 @@
+import os
+import json
+import hashlib
+import inspect
+import logging
+import uuid
+import zipfile
+from functools import lru_cache
+import numpy as np
+import src.indicators
+import src.risk
+from src.price_block import add_columns
+from src.profiling import stage
+
+logger = logging.getLogger(__name__)
+
+# this class is a content-addressed cache of backtest results on disk
+# the key is a hash of the price data , the strategy class and its parameters , the
+# portfolio settings (including any RiskManager) and the source code of the modules that compute
+# the result , so the same inputs always map to the same entry and any change to one of them
+# (including a code change) is a new entry , nothing ever has to be invalidated.
+# each entry is one .npz file with the output columns (signals , equity curve) and the metrics.
+# the file's modification time is its last use , the least recently used entries are
+# deleted once the directory grows past max_bytes.
+
+# bump when the layout of a cache entry changes
+CACHE_VERSION = 1
+
+# modules every backtest depends on besides the strategy's and portfolio's own
+_SHARED_MODULES = (src.indicators, src.risk)
+
+
+# the constructor arguments of an object , read back from attributes of the same name
+# nested objects (a Portfolio's RiskManager) are expanded the same way
+def _params(obj):
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return obj
+    names = [name for name in inspect.signature(type(obj).__init__).parameters if name != 'self']
+    return {'class': type(obj).__name__, **{name: _params(getattr(obj, name)) for name in names}}
+
+
+@lru_cache(maxsize=None)
+def _module_digest(module):
+    return hashlib.sha256(inspect.getsource(module).encode()).hexdigest()
+
+
+# digests of the source of every module the result depends on , code changes give new keys
+def _code_digests(strategy, portfolio):
+    modules = {inspect.getmodule(type(obj)) for obj in (strategy, portfolio, portfolio.risk) if obj is not None}
+    modules.update(_SHARED_MODULES)
+    return {module.__name__: _module_digest(module) for module in modules}
+
+
+# raw bytes of an index or column , object arrays (strings) are hashed by their text
+def _array_bytes(values):
+    values = np.asarray(values)
+    if values.dtype == object:
+        values = values.astype(str)
+    return f"{values.dtype}:".encode() + np.ascontiguousarray(values).tobytes()
+
+
+def performance_metrics(total, initial_capital, shares):
+    total = np.asarray(total, dtype=float)
+    peak = np.maximum.accumulate(total)
+    holding = np.asarray(shares, dtype=float) > 0
+    return {
+        'Final Value': float(total[-1]),
+        'Total Return %': float((total[-1] - initial_capital) / initial_capital * 100),
+        'Max Drawdown %': float(np.min(total / peak - 1.0) * 100),
+        'Trades': int(holding[0]) + int(np.count_nonzero(holding[1:] != holding[:-1])),
+    }
+
+
+class ResultCache:
+
+    def __init__(self, directory='cache', max_bytes=256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    # hex digest of everything the backtest result depends on
+    def key(self, data, strategy, portfolio):
+        digest = hashlib.sha256()
+        settings = {'version': CACHE_VERSION, 'strategy': _params(strategy), 'portfolio': _params(portfolio),
+                    'code': _code_digests(strategy, portfolio)}
+        digest.update(json.dumps(settings, sort_keys=True).encode())
+        digest.update(_array_bytes(data.index))
+        for name in sorted(data.columns):
+            digest.update(f"{name}:".encode())
+            digest.update(_array_bytes(data[name]))
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.npz")
+
+    # (columns , metrics) for a key , or None
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with np.load(path) as entry:
+                columns = {name: entry[name] for name in entry.files if name != '__metrics__'}
+                metrics = json.loads(str(entry['__metrics__']))
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+            # a missing or unreadable entry is a miss , a broken file is recomputed and overwritten
+            if not isinstance(e, FileNotFoundError):
+                logger.warning(f"[!] Ignoring unreadable cache entry {path}: {e}")
+            self.misses += 1
+            return None
+        # mark as recently used , another run may have evicted it in the meantime
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        self.hits += 1
+        return columns, metrics
+
+    def put(self, key, columns, metrics):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        # unique per writer , two runs computing the same key must not share a temp file
+        tmp_path = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, __metrics__=json.dumps(metrics), **columns)
+        # atomic , readers never see a half-written entry
+        os.replace(tmp_path, path)
+        self._evict()
+
+    # deletes least recently used entries until the cache fits in max_bytes
+    def _evict(self):
+        entries = []
+        # other runs can share the directory , an entry that vanishes under us is already gone
+        for name in os.listdir(self.directory):
+            if name.endswith('.npz'):
+                try:
+                    stat = os.stat(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, name))
+        size = sum(entry[1] for entry in entries)
+        for _, entry_size, name in sorted(entries):
+            if size <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+                logger.info(f"[*] Evicted cached result {name}.")
+            except FileNotFoundError:
+                pass
+            size -= entry_size
+
+    # signals + backtest for `data` , served from the cache when these inputs were seen before
+    # returns the same (results , metrics) either way , results has the type of `data`
+    def backtest(self, data, strategy, portfolio):
+        key = self.key(data, strategy, portfolio)
+        cached = self.get(key)
+        if cached is not None:
+            columns, metrics = cached
+            logger.info(f"[*] Using cached backtest result {key[:12]}.")
+            return add_columns(data, columns), metrics
+
+        with stage('signal'):
+            signals = strategy.generate_signals(data)
+        results = portfolio.backtest(signals)
+        columns = {name: np.asarray(results[name]) for name in results.columns if name not in data.columns}
+        metrics = performance_metrics(results['Total'], portfolio.initial_capital, results['Shares'])
+        # the cache only saves time , a failed write must not fail the backtest
+        try:
+            self.put(key, columns, metrics)
+        except OSError as e:
+            logger.error(f"[!] Failed to write backtest result to cache: {e}")
+        return results, metrics
@@ -0,0 +1,178 @@
+import math
+import numpy as np
+import pandas as pd
+from src.indicators import RollingStd
+
+# this class turns a 0/1 strategy target into a risk-managed exposure (fraction of cash to invest)
+#   - volatility targeting: size each entry so annualized volatility is close to target_vol
+#   - stop loss / trailing stop: exit a position once price falls too far below entry / its peak
+#   - drawdown limit: stop trading for good once the account falls too far below its peak
+#
+# like the indicators it has two forms that share the same formulas:
+#   apply(close , target)   -> vectorized over a whole backtest
+#   update(price , target)  -> one bar at a time for live runs
+# a stop or drawdown breach seen at today's close is acted on at the next bar , the same
+# one-day delay the portfolio applies to signals.
+
+TRADING_DAYS = 252
+
+
+class RiskManager:
+
+    def __init__(self, target_vol=None, vol_window=20, max_weight=1.0,
+                 stop_loss_pct=None, trailing_stop_pct=None, max_drawdown_pct=None):
+        # check for valid parameters
+        if not 0.0 < max_weight <= 1.0:
+            raise ValueError(f"[!] max_weight ({max_weight}) must be in (0, 1]. The ledger does not use margin.")
+        for name, value in (('stop_loss_pct', stop_loss_pct), ('trailing_stop_pct', trailing_stop_pct),
+                            ('max_drawdown_pct', max_drawdown_pct)):
+            if value is not None and not 0.0 < value < 100.0:
+                raise ValueError(f"[!] {name} ({value}) must be between 0 and 100.")
+
+        self.target_vol = target_vol
+        self.vol_window = vol_window
+        self.max_weight = max_weight
+        self.stop_loss_pct = stop_loss_pct
+        self.trailing_stop_pct = trailing_stop_pct
+        self.max_drawdown_pct = max_drawdown_pct
+        self.reset()
+
+    # --- shared formulas , work on numpy arrays and on plain floats ---
+
+    def position_weight(self, annual_vol):
+        if self.target_vol is None:
+            return np.full(np.shape(annual_vol), self.max_weight) if np.ndim(annual_vol) else self.max_weight
+        with np.errstate(divide='ignore', invalid='ignore'):
+            weight = np.where(np.isfinite(annual_vol) & (annual_vol > 0),
+                              np.minimum(self.max_weight, self.target_vol / annual_vol), 0.0)
+        return weight if np.ndim(weight) else float(weight)
+
+    def stop_hit(self, price, entry_price, peak_price):
+        hit = np.zeros(np.shape(price), dtype=bool)
+        if self.stop_loss_pct is not None:
+            hit |= price <= entry_price * (1 - self.stop_loss_pct / 100)
+        if self.trailing_stop_pct is not None:
+            hit |= price <= peak_price * (1 - self.trailing_stop_pct / 100)
+        return hit if np.ndim(hit) else bool(hit)
+
+    def drawdown_breached(self, equity, peak_equity):
+        if self.max_drawdown_pct is None:
+            return np.zeros(np.shape(equity), dtype=bool) if np.ndim(equity) else False
+        return (equity / peak_equity - 1) * 100 <= -self.max_drawdown_pct
+
+    # --- vectorized form ---
+
+    def apply(self, close, target):
+        close = np.asarray(close, dtype=float)
+        target = np.asarray(target, dtype=float) == 1.0
+        n = len(close)
+
+        # size from volatility known at the previous close
+        returns = close[1:] / close[:-1] - 1
+        annual_vol = np.full(n, np.nan)
+        annual_vol[1:] = RollingStd(self.vol_window).batch(returns) * math.sqrt(TRADING_DAYS)
+        weight = np.empty(n)
+        weight[0] = self.position_weight(math.nan)
+        weight[1:] = self.position_weight(annual_vol[:-1])
+
+        # each run of consecutive target == 1 is one position , sized and priced at its first bar
+        starts = target & ~np.concatenate([[False], target[:-1]])
+        segment = pd.Series(np.where(target, np.cumsum(starts), 0))
+        by_segment = pd.Series(close).where(target).groupby(segment)
+        entry_price = pd.Series(np.where(starts, close, np.nan)).groupby(segment).ffill().to_numpy()
+        entry_weight = pd.Series(np.where(starts, weight, np.nan)).groupby(segment).ffill().to_numpy()
+        peak_price = by_segment.cummax().to_numpy()
+
+        hit = self.stop_hit(close, entry_price, peak_price) & target
+        # stopped from the bar after the first hit until the position ends
+        hit_so_far = pd.Series(hit).groupby(segment).cummax()
+        stopped = hit_so_far.groupby(segment).shift(1, fill_value=False).to_numpy(dtype=bool) & target
+
+        exposure = np.where(target & ~stopped, entry_weight, 0.0)
+        return pd.DataFrame({'Weight': weight, 'Exposure': exposure, 'Stopped': stopped})
+
+    # first bar after the drawdown limit is breached , None if it never is
+    def halt_index(self, equity):
+        equity = np.asarray(equity, dtype=float)
+        breached = self.drawdown_breached(equity, np.maximum.accumulate(equity))
+        hits = np.flatnonzero(breached)
+        return int(hits[0]) + 1 if len(hits) else None
+
+    # --- incremental form ---
+
+    def reset(self):
+        self._vol = RollingStd(self.vol_window)
+        self._prev_price = None
+        self._next_weight = self.position_weight(math.nan)
+        self._in_position = False
+        self._hit = False
+        self.stopped = False
+        self.halted = False
+        self.peak_equity = -math.inf
+
+    def update(self, price, target):
+        weight = self._next_weight
+        if self._prev_price is not None:
+            vol = self._vol.update(price / self._prev_price - 1) * math.sqrt(TRADING_DAYS)
+            self._next_weight = self.position_weight(vol)
+        self._prev_price = price
+
+        if target != 1.0:
+            self._in_position = False
+            self.stopped = False
+            return 0.0
+        if not self._in_position:
+            self._in_position = True
+            self._entry_price = self._peak_price = price
+            self._entry_weight = weight
+            self._hit = False
+            self.stopped = False
+        self.stopped = self.stopped or self._hit
+        self._peak_price = max(self._peak_price, price)
+        self._hit = self.stop_hit(price, self._entry_price, self._peak_price)
+        if self.halted or self.stopped:
+            return 0.0
+        return self._entry_weight
+
+    # warms the volatility estimate up from history without opening a position
+    def prime(self, prices):
+        self.reset()
+        for price in prices:
+            self.update(price, 0.0)
+
+    @property
+    def has_stops(self):
+        return self.stop_loss_pct is not None or self.trailing_stop_pct is not None
+
+    # the open position's stop state , plain values so live runs can save it between days
+    def position_state(self):
+        if not self._in_position:
+            return {'in_position': False}
+        return {'in_position': True, 'entry_price': self._entry_price, 'peak_price': self._peak_price,
+                'entry_weight': self._entry_weight, 'hit': bool(self._hit), 'stopped': bool(self.stopped)}
+
+    def restore_position(self, state):
+        self._in_position = bool(state.get('in_position'))
+        if self._in_position:
+            self._entry_price = state['entry_price']
+            self._peak_price = state['peak_price']
+            self._entry_weight = state['entry_weight']
+            self._hit = state['hit']
+            self.stopped = state['stopped']
+
+    # replaces the modelled entry (a close) with the real fill price of an open position
+    def set_entry_price(self, price):
+        if not self._in_position:
+            self._in_position = True
+            self._peak_price = price
+            self._entry_weight = self._next_weight
+            self._hit = False
+            self.stopped = False
+        self._entry_price = price
+        self._peak_price = max(self._peak_price, price)
+
+    # feed the account value after each bar , returns True once trading must halt
+    def update_equity(self, equity):
+        self.peak_equity = max(self.peak_equity, equity)
+        self.halted = self.halted or self.drawdown_breached(equity, self.peak_equity)
+        return self.halted
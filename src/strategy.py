@@ -1,34 +1,54 @@
 import numpy as np
+from src.indicators import MOVING_AVERAGES
+from src.price_block import add_columns
 
 # this class contains the logic for moving average crossover
-# takes price data and calculates buy/hold/sell signals
+# takes price data (DataFrame or PriceBlock) and calculates buy/hold/sell signals
 
 class MACrossoverStrategy:
 
-    def __init__(self , short_window=50 , long_window=200):
+    def __init__(self , short_window=50 , long_window=200 , ma_type='sma'):
         # check for valid parameters
         if short_window >= long_window:
             raise ValueError(f"[!] short_window ({short_window}) must be less than long_window ({long_window}).")
+        if ma_type not in MOVING_AVERAGES:
+            raise ValueError(f"[!] Unknown moving average '{ma_type}'. Use one of {list(MOVING_AVERAGES)}.")
         
         self.short_window = short_window
         self.long_window = long_window
+        self.ma_type = ma_type
+        # incremental state for bar-by-bar use , see update()
+        self.short_ma = MOVING_AVERAGES[ma_type](short_window)
+        self.long_ma = MOVING_AVERAGES[ma_type](long_window)
 
     def generate_signals(self , data):
         
-        print(f"[*] Calculating {self.short_window}-day and {self.long_window}-day moving averages...")
+        print(f"[*] Calculating {self.short_window}-day and {self.long_window}-day {self.ma_type.upper()} moving averages...")
         # check for needed columns
         if 'Close' not in data.columns:
             raise ValueError("[!] STRATEGY ERROR: Missing required column 'Close'.")
-        data = data.copy()
-        #calculate moving averages
-        data['SMA_Short'] = data['Close'].rolling(window=self.short_window).mean()
-        data['SMA_Long'] = data['Close'].rolling(window=self.long_window).mean()
+        #calculate moving averages , column names are kept for every ma_type so downstream code doesn't change
+        close = np.asarray(data['Close'], dtype=float)
+        sma_short = MOVING_AVERAGES[self.ma_type](self.short_window).batch(close)
+        sma_long = MOVING_AVERAGES[self.ma_type](self.long_window).batch(close)
 
         # calculate signals
-        data['Signal'] = np.where(data['SMA_Short'] > data['SMA_Long'], 1.0, 0.0)
+        signal = np.where(sma_short > sma_long, 1.0, 0.0)
 
         # calculate positions
-        data['Position'] = data['Signal'].diff()
+        position = np.concatenate([[np.nan], np.diff(signal)])
 
         print("[*] Trading signals generated successfully.")
-        return data
\ No newline at end of file
+        return add_columns(data, {'SMA_Short': sma_short, 'SMA_Long': sma_long, 'Signal': signal, 'Position': position})
+
+    # O(1) streaming form: feed one new close and get the current signal without recomputing the window
+    # call prime() first with the history so both averages are warm. The live bot downloads a fresh
+    # history every run and uses generate_signals() , this form is for bar-by-bar consumers
+    def update(self , price):
+        short_ma = self.short_ma.update(price)
+        long_ma = self.long_ma.update(price)
+        return 1.0 if short_ma > long_ma else 0.0
+
+    def prime(self , prices):
+        self.short_ma.prime(prices)
+        self.long_ma.prime(prices)
@@ -0,0 +1,159 @@
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+
+# this class is a local NYSE trading calendar , no network calls
+# every session between start_year and end_year is precomputed once into sorted numpy arrays
+# (session dates and their open / close times in UTC) and every lookup is a binary search
+
+EXCHANGE_TZ = 'America/New_York'
+OPEN_TIME = '09:30'
+CLOSE_TIME = '16:00'
+EARLY_CLOSE_TIME = '13:00'
+
+# one-off closures that no rule can predict (national mourning , weather , 9/11)
+SPECIAL_CLOSURES = [
+    '2001-09-11', '2001-09-12', '2001-09-13', '2001-09-14',
+    '2004-06-11', '2007-01-02', '2012-10-29', '2012-10-30',
+    '2018-12-05', '2025-01-09',
+]
+
+
+def _easter(year):
+    # anonymous Gregorian algorithm
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _nth_weekday(year, month, weekday, n):
+    # n-th (1-based) weekday of a month , n = -1 for the last one
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _observed(day):
+    # Saturday holidays move to Friday , Sunday holidays to Monday
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+def _holidays(year):
+    holidays = [
+        _nth_weekday(year, 2, 0, 3),                # Washington's Birthday
+        _easter(year) - timedelta(days=2),          # Good Friday
+        _nth_weekday(year, 5, 0, -1),               # Memorial Day
+        _observed(date(year, 7, 4)),                # Independence Day
+        _nth_weekday(year, 9, 0, 1),                # Labor Day
+        _nth_weekday(year, 11, 3, 4),               # Thanksgiving
+        _observed(date(year, 12, 25)),              # Christmas
+    ]
+    # NYSE does not close on Friday Dec 31 when New Year's Day falls on a Saturday
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:
+        holidays.append(_observed(new_year))
+    if year >= 1998:
+        holidays.append(_nth_weekday(year, 1, 0, 3))   # Martin Luther King Jr. Day
+    if year >= 2022:
+        holidays.append(_observed(date(year, 6, 19)))  # Juneteenth
+    return holidays
+
+
+def _early_closes(year):
+    return [
+        date(year, 7, 3),                                          # day before Independence Day
+        _nth_weekday(year, 11, 3, 4) + timedelta(days=1),          # day after Thanksgiving
+        date(year, 12, 24),                                        # Christmas Eve
+    ]
+
+
+class TradingCalendar:
+
+    def __init__(self, start_year=2000, end_year=2035):
+        if start_year > end_year:
+            raise ValueError(f"[!] start_year ({start_year}) must not be after end_year ({end_year}).")
+        self.start_year = start_year
+        self.end_year = end_year
+
+        holidays = [d for year in range(start_year, end_year + 1) for d in _holidays(year)]
+        holidays += [date.fromisoformat(d) for d in SPECIAL_CLOSURES]
+        days = np.arange(np.datetime64(f'{start_year}-01-01'), np.datetime64(f'{end_year + 1}-01-01'))
+        is_session = np.is_busday(days, holidays=np.array(holidays, dtype='datetime64[D]'))
+        self.sessions = days[is_session]
+
+        early = np.array([d for year in range(start_year, end_year + 1) for d in _early_closes(year)],
+                         dtype='datetime64[D]')
+        self.early_closes = np.intersect1d(self.sessions, early)
+
+        # open / close of every session as UTC datetime64 , daylight saving handled by pandas
+        session_dates = pd.DatetimeIndex(self.sessions)
+        close_times = np.where(np.isin(self.sessions, self.early_closes), EARLY_CLOSE_TIME, CLOSE_TIME)
+        self.opens = self._to_utc(session_dates.strftime('%Y-%m-%d') + f' {OPEN_TIME}')
+        self.closes = self._to_utc(session_dates.strftime('%Y-%m-%d') + ' ' + close_times)
+
+    @staticmethod
+    def _to_utc(local_times):
+        return pd.DatetimeIndex(local_times).tz_localize(EXCHANGE_TZ).tz_convert('UTC').tz_localize(None).to_numpy()
+
+    @staticmethod
+    def _day(value):
+        return np.datetime64(pd.Timestamp(value).date(), 'D')
+
+    @staticmethod
+    def _utc(now):
+        now = pd.Timestamp(now if now is not None else datetime.now(timezone.utc))
+        if now.tzinfo is not None:
+            now = now.tz_convert('UTC').tz_localize(None)
+        return now.to_datetime64()
+
+    def _check_range(self, position):
+        if position < 0 or position >= len(self.sessions):
+            raise ValueError(f"[!] Date outside the precomputed calendar ({self.start_year}-{self.end_year}).")
+        return position
+
+    def is_session(self, day):
+        day = self._day(day)
+        i = np.searchsorted(self.sessions, day)
+        return bool(i < len(self.sessions) and self.sessions[i] == day)
+
+    def is_early_close(self, day):
+        day = self._day(day)
+        i = np.searchsorted(self.early_closes, day)
+        return bool(i < len(self.early_closes) and self.early_closes[i] == day)
+
+    # the most recent session whose close is at or before `now` (UTC if naive)
+    def last_completed_session(self, now=None):
+        i = self._check_range(np.searchsorted(self.closes, self._utc(now), side='right') - 1)
+        return pd.Timestamp(self.sessions[i]).date()
+
+    # open and close (UTC) of the session in progress , or of the next one if the market is closed
+    def next_session(self, now=None):
+        i = self._check_range(np.searchsorted(self.closes, self._utc(now), side='right'))
+        return pd.Timestamp(self.opens[i]).tz_localize('UTC'), pd.Timestamp(self.closes[i]).tz_localize('UTC')
+
+    # number of sessions (daily bars) between two dates , both ends included
+    def sessions_between(self, start, end):
+        first = np.searchsorted(self.sessions, self._day(start), side='left')
+        last = np.searchsorted(self.sessions, self._day(end), side='right')
+        return int(max(last - first, 0))
+
+
+# built once per process and shared
+@lru_cache(maxsize=1)
+def get_calendar():
+    return TradingCalendar()
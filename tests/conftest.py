@@ -0,0 +1,16 @@
+import numpy as np
+import pandas as pd
+
+# shared test data: seeded geometric brownian motion prices
+
+
+def gbm_prices(days=400, seed=0, drift=0.0003, vol=0.01):
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(drift, vol, days)))
+
+
+# daily price frame starting 2020-01-01 , every column in `columns` holds the same prices
+def gbm_frame(days=400, seed=0, columns=('Close',), **kwargs):
+    prices = gbm_prices(days, seed, **kwargs)
+    dates = pd.date_range(start='2020-01-01', periods=days)
+    return pd.DataFrame({name: prices for name in columns}, index=dates)
@@ -51,4 +51,132 @@ def test_broker_returns_zero_for_no_position(mock_getenv, mock_rest_class):
 def test_broker_raises_on_missing_keys(mock_getenv, mock_rest_class):
     mock_getenv.return_value = None
     with pytest.raises(ValueError, match="Missing Alpaca API keys"):
-        AlpacaBroker()
\ No newline at end of file
+        AlpacaBroker()
+
+@patch('src.broker.tradeapi.REST')
+@patch('src.broker.os.getenv')
+def test_broker_caches_account_queries(mock_getenv, mock_rest_class):
+    mock_getenv.return_value = "FAKE_KEY"
+    mock_api_instance = mock_rest_class.return_value
+    mock_api_instance.get_account.return_value.status = "ACTIVE"
+    mock_api_instance.get_account.return_value.buying_power = "1000.0"
+    mock_api_instance.get_account.return_value.portfolio_value = "10000.0"
+    mock_api_instance.get_account.return_value.last_equity = "9900.0"
+
+    broker = AlpacaBroker()
+    assert broker.get_buying_power() == 1000.0
+    assert broker.get_portfolio_value() == 10000.0
+    assert broker.get_initial_equity() == 9900.0
+
+    # key validation + 3 lookups should only hit the network once
+    assert mock_api_instance.get_account.call_count == 1
+    assert broker.cache_misses == 1
+    assert broker.cache_hits == 3
+
+
+@patch('src.broker.tradeapi.REST')
+@patch('src.broker.os.getenv')
+def test_broker_cache_invalidated_after_order(mock_getenv, mock_rest_class):
+    mock_getenv.return_value = "FAKE_KEY"
+    mock_api_instance = mock_rest_class.return_value
+    mock_api_instance.get_account.return_value.status = "ACTIVE"
+    mock_api_instance.get_position.return_value.qty = "0.0"
+
+    broker = AlpacaBroker()
+    broker.get_position("SPY")
+    broker.get_position("SPY")
+    assert mock_api_instance.get_position.call_count == 1
+
+    # after an order the position must be re-read from the broker
+    broker.submit_order("SPY", 5, 'buy')
+    mock_api_instance.get_position.return_value.qty = "5.0"
+    assert broker.get_position("SPY") == 5.0
+    assert mock_api_instance.get_position.call_count == 2
+
+
+@patch('src.broker.time.monotonic')
+@patch('src.broker.tradeapi.REST')
+@patch('src.broker.os.getenv')
+def test_broker_cache_expires_after_ttl(mock_getenv, mock_rest_class, mock_monotonic):
+    mock_getenv.return_value = "FAKE_KEY"
+    mock_api_instance = mock_rest_class.return_value
+    mock_api_instance.get_account.return_value.status = "ACTIVE"
+    mock_api_instance.get_clock.return_value.is_open = False
+    mock_monotonic.return_value = 100.0
+
+    broker = AlpacaBroker(cache_ttls={'clock': 10.0})
+    broker.is_market_open()
+    mock_monotonic.return_value = 105.0
+    broker.is_market_open()
+    assert mock_api_instance.get_clock.call_count == 1
+
+    # past the TTL the clock is fetched again
+    mock_monotonic.return_value = 111.0
+    broker.is_market_open()
+    assert mock_api_instance.get_clock.call_count == 2
+
+
+@patch('src.broker.tradeapi.REST')
+@patch('src.broker.os.getenv')
+def test_broker_returns_none_for_unknown_client_order_id(mock_getenv, mock_rest_class):
+    mock_getenv.return_value = "FAKE_KEY"
+    mock_api_instance = mock_rest_class.return_value
+    mock_api_instance.get_account.return_value.status = "ACTIVE"
+    mock_api_instance.get_order_by_client_order_id.side_effect = tradeapi.rest.APIError({"message": "order not found"})
+
+    broker = AlpacaBroker()
+
+    assert broker.get_order_by_client_id("algotrad-2026-01-05-SPY-buy") is None
+
+
+@patch('src.broker.tradeapi.REST')
+@patch('src.broker.os.getenv')
+def test_broker_equity_peak_skips_missing_days_and_is_cached(mock_getenv, mock_rest_class):
+    mock_getenv.return_value = "FAKE_KEY"
+    mock_api_instance = mock_rest_class.return_value
+    mock_api_instance.get_account.return_value.status = "ACTIVE"
+    mock_api_instance.get_portfolio_history.return_value.equity = [10000.0, None, 10500.0, 10200.0]
+
+    broker = AlpacaBroker()
+
+    assert broker.get_equity_peak() == 10500.0
+    assert broker.get_equity_peak() == 10500.0
+    mock_api_instance.get_portfolio_history.assert_called_once_with(period='1A', timeframe='1D')
+
+
+@patch('src.broker.tradeapi.REST')
+@patch('src.broker.os.getenv')
+def test_broker_entry_price_shares_the_position_lookup(mock_getenv, mock_rest_class):
+    mock_getenv.return_value = "FAKE_KEY"
+    mock_api_instance = mock_rest_class.return_value
+    mock_api_instance.get_account.return_value.status = "ACTIVE"
+    mock_api_instance.get_position.return_value.qty = "15.0"
+    mock_api_instance.get_position.return_value.avg_entry_price = "401.25"
+
+    broker = AlpacaBroker()
+
+    assert broker.get_position("SPY") == 15.0
+    assert broker.get_entry_price("SPY") == 401.25
+    mock_api_instance.get_position.assert_called_once_with("SPY")
+
+    # no position -> no entry price
+    broker.invalidate_cache()
+    mock_api_instance.get_position.side_effect = tradeapi.rest.APIError({"message": "position does not exist"})
+    assert broker.get_entry_price("SPY") is None
+
+
+@patch('src.broker.tradeapi.REST')
+@patch('src.broker.os.getenv')
+def test_broker_cache_counters_are_thread_safe(mock_getenv, mock_rest_class):
+    from concurrent.futures import ThreadPoolExecutor
+    mock_getenv.return_value = "FAKE_KEY"
+    mock_api_instance = mock_rest_class.return_value
+    mock_api_instance.get_account.return_value.status = "ACTIVE"
+    mock_api_instance.get_account.return_value.portfolio_value = "10000.0"
+
+    broker = AlpacaBroker()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda _: broker.get_portfolio_value(), range(2000)))
+
+    # every lookup is counted exactly once , as a hit or a miss
+    assert broker.cache_hits + broker.cache_misses == 2001
@@ -0,0 +1,82 @@
+import pytest
+import pandas as pd
+import numpy as np
+from src.indicators import Indicator, SMA, EMA, WMA, RollingStd, ZScore, RollingMax, RollingMin, ATR
+from src.strategy import MACrossoverStrategy
+from tests.conftest import gbm_prices
+
+@pytest.mark.parametrize("indicator_class", [SMA, EMA, WMA, RollingStd, ZScore, RollingMax, RollingMin])
+@pytest.mark.parametrize("window", [1, 2, 20])
+def test_batch_matches_incremental(indicator_class, window):
+    # The vectorized form and the O(1) update form must give the same numbers
+    prices = gbm_prices()
+    batch = indicator_class(window).batch(prices)
+
+    indicator = indicator_class(window)
+    incremental = np.array([indicator.update(p) for p in prices])
+
+    np.testing.assert_allclose(batch, incremental, rtol=1e-9, atol=1e-9, equal_nan=True)
+
+def test_batch_matches_pandas():
+    prices = gbm_prices()
+    series = pd.Series(prices)
+    np.testing.assert_allclose(SMA(20).batch(prices), series.rolling(20).mean(), equal_nan=True)
+    np.testing.assert_allclose(RollingStd(20).batch(prices), series.rolling(20).std(), equal_nan=True)
+    np.testing.assert_allclose(RollingMax(20).batch(prices), series.rolling(20).max(), equal_nan=True)
+    np.testing.assert_allclose(EMA(20).batch(prices), series.ewm(span=20, adjust=False, min_periods=20).mean(), equal_nan=True)
+
+def test_batch_handles_many_series_at_once():
+    paths = np.vstack([gbm_prices(seed=s) for s in range(3)])
+    for indicator_class in (SMA, EMA, WMA, RollingStd, RollingMin):
+        batch = indicator_class(10).batch(paths)
+        assert batch.shape == paths.shape
+        np.testing.assert_allclose(batch[1], indicator_class(10).batch(paths[1]), equal_nan=True)
+
+def test_atr_batch_matches_incremental():
+    close = gbm_prices()
+    high = close * 1.01
+    low = close * 0.98
+    batch = ATR(14).batch(high, low, close)
+
+    atr = ATR(14)
+    incremental = np.array([atr.update(h, l, c) for h, l, c in zip(high, low, close)])
+
+    assert np.isnan(batch[:13]).all()
+    np.testing.assert_allclose(batch, incremental, rtol=1e-9, equal_nan=True)
+
+def test_strategy_live_update_matches_batch_signal():
+    # Priming on history then feeding one bar should give the same signal as a full recompute
+    prices = gbm_prices(days=260)
+    for ma_type in ('sma', 'ema', 'wma'):
+        strategy = MACrossoverStrategy(short_window=10, long_window=30, ma_type=ma_type)
+        full = strategy.generate_signals(pd.DataFrame({'Close': prices}))
+        strategy.prime(prices[:-1])
+        assert strategy.update(prices[-1]) == full['Signal'].iloc[-1]
+
+def test_indicator_rejects_bad_window():
+    with pytest.raises(ValueError, match="window must be at least 1"):
+        SMA(0)
+
+def test_flat_prices_give_exact_ties():
+    # Forward-filled gaps give flat stretches , both averages must equal the price exactly so no crossover fires
+    prices = np.concatenate([np.linspace(400.0, 437.1, 100), np.full(60, 437.1)])
+    for indicator in (SMA(7), SMA(50)):
+        assert (indicator.batch(prices)[-10:] == 437.1).all()
+        assert indicator.prime(prices) == 437.1
+
+    signals = MACrossoverStrategy(short_window=7, long_window=50).generate_signals(pd.DataFrame({'Close': prices}))
+    # the last 10 bars have a completely flat long window
+    assert (signals['Signal'].iloc[-10:] == 0.0).all()
+    np.testing.assert_array_equal(signals['Signal'], np.where(
+        pd.Series(prices).rolling(7).mean() > pd.Series(prices).rolling(50).mean(), 1.0, 0.0))
+
+def test_sma_error_does_not_grow_with_length():
+    prices = gbm_prices(days=200_000, seed=1) * 1000
+    batch = SMA(50).batch(prices)
+    np.testing.assert_allclose(batch[-100:], pd.Series(prices[-200:]).rolling(50).mean()[-100:], rtol=1e-13)
+
+def test_indicator_requires_update():
+    class Incomplete(Indicator):
+        pass
+    with pytest.raises(TypeError):
+        Incomplete(5)
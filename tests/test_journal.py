@@ -0,0 +1,49 @@
+import pytest
+import pandas as pd
+from src.journal import TradeJournal
+
+def test_journal_batches_and_queries_by_symbol_and_date(tmp_path):
+    journal = TradeJournal(root=str(tmp_path), batch_size=2)
+
+    journal.record_decision('SPY', action='buy', qty=9.0)
+    # nothing on disk until the batch fills
+    assert journal.query('decisions').empty
+    journal.record_decision('QQQ', action='hold')
+
+    spy = journal.query('decisions', symbol='SPY')
+    assert len(spy) == 1
+    assert spy['action'].iloc[0] == 'buy'
+    assert len(journal.query('decisions')) == 2
+
+    today = spy['date'].iloc[0]
+    assert len(journal.query('decisions', start=today, end=today)) == 2
+    assert journal.query('decisions', end='2000-01-01').empty
+
+def test_journal_is_append_only(tmp_path):
+    # every flush adds a new file , earlier records are never rewritten
+    with TradeJournal(root=str(tmp_path)) as journal:
+        journal.record_backtest('SPY', total_return_pct=12.5)
+    with TradeJournal(root=str(tmp_path)) as journal:
+        journal.record_backtest('SPY', total_return_pct=-3.0)
+
+    results = TradeJournal(root=str(tmp_path)).query('backtests', symbol='SPY')
+    assert list(results['total_return_pct']) == [12.5, -3.0]
+
+def test_journal_rejects_unknown_table(tmp_path):
+    with pytest.raises(ValueError, match="Unknown journal table"):
+        TradeJournal(root=str(tmp_path)).query('orders')
+
+def test_compact_merges_partition_files(tmp_path):
+    # one journal per run , like the live bot , gives one file per run
+    for qty in (1.0, 2.0, 3.0):
+        with TradeJournal(root=str(tmp_path)) as journal:
+            journal.record_decision('SPY', action='buy', qty=qty)
+    journal = TradeJournal(root=str(tmp_path))
+    partition = next((tmp_path / 'decisions' / 'symbol=SPY').iterdir())
+    assert len(list(partition.glob('*.parquet'))) == 3
+
+    assert journal.compact('decisions') == 3
+    assert len(list(partition.iterdir())) == 1
+    assert list(journal.query('decisions', symbol='SPY')['qty']) == [1.0, 2.0, 3.0]
+    # nothing left to merge
+    assert journal.compact('decisions') == 0
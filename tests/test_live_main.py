@@ -1,8 +1,28 @@
 import pytest
+import numpy as np
 import pandas as pd
 from unittest.mock import patch, MagicMock
 from live_main import run_live_bot
 
+@pytest.fixture(autouse=True)
+def mock_journal():
+    """Keep the live bot from writing journal files during tests."""
+    with patch('live_main.TradeJournal') as mock_journal_class:
+        yield mock_journal_class.return_value.__enter__.return_value
+
+
+@pytest.fixture(autouse=True)
+def checkpoint_dir(tmp_path, monkeypatch):
+    """Give every test its own empty checkpoint folder."""
+    monkeypatch.setattr('live_main.CHECKPOINT_DIR', str(tmp_path))
+    return tmp_path
+
+
+def client_id(side):
+    from datetime import datetime
+    return f"algotrad-{datetime.today():%Y-%m-%d}-SPY-{side}"
+
+
 # ==========================================
 # HELPER - creates a fake signals dataframe
 # ==========================================
@@ -43,7 +63,7 @@ def test_buy_order_submitted_and_alert_sent(mock_strategy_class, mock_handler_cl
     run_live_bot()
 
     # Math: $1000 * 0.95 = $950 // $100 = 9 shares
-    mock_broker.submit_order.assert_called_once_with('SPY', 9, 'buy')
+    mock_broker.submit_order.assert_called_once_with('SPY', 9, 'buy', client_order_id=client_id('buy'))
     mock_broker.confirm_order.assert_called_once_with('order-123')
     mock_send_alert.assert_called_once()
 
@@ -68,7 +88,7 @@ def test_sell_order_submitted_and_alert_sent(mock_strategy_class, mock_handler_c
 
     run_live_bot()
 
-    mock_broker.submit_order.assert_called_once_with('SPY', 15.0, 'sell')
+    mock_broker.submit_order.assert_called_once_with('SPY', 15.0, 'sell', client_order_id=client_id('sell'))
     mock_broker.confirm_order.assert_called_once_with('order-456')
     mock_send_alert.assert_called_once()
 
@@ -238,3 +258,337 @@ def test_stale_data_aborts(mock_strategy_class, mock_handler_class, mock_broker_
 
     # Should abort before any trading
     mock_broker.submit_order.assert_not_called()
+
+
+def pin_today(monkeypatch, day):
+    """Make the live bot believe it runs on `day` (an ISO date string)."""
+    from datetime import datetime
+    class PinnedDatetime(datetime):
+        @classmethod
+        def today(cls):
+            return cls.fromisoformat(f"{day} 22:15")
+    monkeypatch.setattr('live_main.datetime', PinnedDatetime)
+
+
+@pytest.mark.parametrize("last_bar, action, warned", [
+    ('2026-10-19', 'buy', False),          # normal run: the download ends the session before today
+    ('2026-10-16', 'buy', True),           # one late bar is tolerated with a warning
+    ('2026-10-15', 'abort_stale', False),  # two sessions missing
+])
+@patch('live_main.send_alert')
+@patch('live_main.AlpacaBroker')
+@patch('live_main.DataHandler')
+@patch('live_main.MACrossoverStrategy')
+def test_staleness_counts_sessions_before_the_download_end(mock_strategy_class, mock_handler_class, mock_broker_class,
+                                                           mock_send_alert, last_bar, action, warned,
+                                                           monkeypatch, caplog, mock_journal):
+    """Tuesday 2026-10-20 after the close: the newest bar the download can hold is Monday's."""
+    pin_today(monkeypatch, '2026-10-20')
+    mock_broker = mock_broker_class.return_value
+    mock_broker.get_last_price.return_value = 100.0
+    mock_broker.get_position.return_value = 0.0
+    mock_broker.get_buying_power.return_value = 1000.0
+    mock_broker.is_market_open.return_value = False
+    mock_broker.has_open_trade.return_value = False
+    mock_broker.get_portfolio_value.return_value = 10000.0
+    mock_broker.get_initial_equity.return_value = 10000.0
+    mock_broker.submit_order.return_value = MagicMock(id='order-123')
+    mock_handler_class.return_value.fetch_data.return_value = pd.DataFrame()
+    dates = pd.bdate_range(end=last_bar, periods=3)
+    mock_strategy_class.return_value.generate_signals.return_value = pd.DataFrame({
+        'Close': [490.0, 495.0, 500.0],
+        'Signal': [1.0, 1.0, 1.0]
+    }, index=dates)
+
+    run_live_bot()
+
+    assert mock_journal.record_decision.call_args[1]['action'] == action
+    assert ('missing' in caplog.text) == warned
+
+
+# ==========================================
+# JOURNAL TESTS
+# ==========================================
+
+@patch('live_main.send_alert')
+@patch('live_main.AlpacaBroker')
+@patch('live_main.DataHandler')
+@patch('live_main.MACrossoverStrategy')
+def test_buy_decision_is_journaled(mock_strategy_class, mock_handler_class, mock_broker_class, mock_send_alert, mock_journal):
+    """Every run should record what it saw and did in the journal."""
+    mock_broker = mock_broker_class.return_value
+    mock_broker.get_last_price.return_value = 100.0
+    mock_broker.get_position.return_value = 0.0
+    mock_broker.get_buying_power.return_value = 1000.0
+    mock_broker.is_market_open.return_value = False
+    mock_broker.has_open_trade.return_value = False
+    mock_broker.get_portfolio_value.return_value = 10000.0
+    mock_broker.get_initial_equity.return_value = 10000.0
+    mock_broker.submit_order.return_value = MagicMock(id='order-123')
+    mock_broker.confirm_order.return_value = 'filled'
+    mock_handler = mock_handler_class.return_value
+    mock_handler.fetch_data.return_value = pd.DataFrame()
+    mock_strategy = mock_strategy_class.return_value
+    mock_strategy.generate_signals.return_value = make_signals(1.0)
+
+    run_live_bot()
+
+    symbol = mock_journal.record_decision.call_args[0][0]
+    record = mock_journal.record_decision.call_args[1]
+    assert symbol == 'SPY'
+    assert record['action'] == 'buy'
+    assert record['qty'] == 9
+    assert record['order_id'] == 'order-123'
+    assert record['order_status'] == 'filled'
+    assert 'total_ms' in record
+
+
+# ==========================================
+# CHECKPOINT / IDEMPOTENCY TESTS
+# ==========================================
+
+@patch('live_main.send_alert')
+@patch('live_main.AlpacaBroker')
+@patch('live_main.DataHandler')
+@patch('live_main.MACrossoverStrategy')
+def test_second_run_same_day_does_nothing(mock_strategy_class, mock_handler_class, mock_broker_class, mock_send_alert):
+    """A double-fired scheduler must not place a second order."""
+    mock_broker = mock_broker_class.return_value
+    mock_broker.get_last_price.return_value = 100.0
+    mock_broker.get_position.return_value = 0.0
+    mock_broker.get_buying_power.return_value = 1000.0
+    mock_broker.is_market_open.return_value = False
+    mock_broker.has_open_trade.return_value = False
+    mock_broker.get_portfolio_value.return_value = 10000.0
+    mock_broker.get_initial_equity.return_value = 10000.0
+    mock_broker.submit_order.return_value = MagicMock(id='order-123')
+    mock_handler = mock_handler_class.return_value
+    mock_handler.fetch_data.return_value = pd.DataFrame()
+    mock_strategy = mock_strategy_class.return_value
+    mock_strategy.generate_signals.return_value = make_signals(1.0)
+
+    run_live_bot()
+    run_live_bot()
+
+    mock_broker.submit_order.assert_called_once()
+    mock_handler.fetch_data.assert_called_once()
+
+
+@patch('live_main.send_alert')
+@patch('live_main.AlpacaBroker')
+@patch('live_main.DataHandler')
+@patch('live_main.MACrossoverStrategy')
+def test_crash_after_submit_adopts_existing_order(mock_strategy_class, mock_handler_class, mock_broker_class, mock_send_alert):
+    """If the bot crashed after submitting, the restart confirms that order instead of buying again."""
+    mock_broker = mock_broker_class.return_value
+    mock_broker.get_last_price.return_value = 100.0
+    mock_broker.get_position.return_value = 0.0
+    mock_broker.get_buying_power.return_value = 1000.0
+    mock_broker.is_market_open.return_value = False
+    mock_broker.has_open_trade.return_value = False
+    mock_broker.get_portfolio_value.return_value = 10000.0
+    mock_broker.get_initial_equity.return_value = 10000.0
+    mock_broker.submit_order.return_value = MagicMock(id='order-123')
+    # crash while confirming the order
+    mock_broker.confirm_order.side_effect = ConnectionError("network down")
+    mock_handler = mock_handler_class.return_value
+    mock_handler.fetch_data.return_value = pd.DataFrame()
+    mock_strategy = mock_strategy_class.return_value
+    mock_strategy.generate_signals.return_value = make_signals(1.0)
+
+    with pytest.raises(ConnectionError):
+        run_live_bot()
+
+    mock_broker.confirm_order.side_effect = None
+    mock_broker.confirm_order.return_value = 'filled'
+    mock_broker.get_order_by_client_id.return_value = MagicMock(id='order-123')
+
+    run_live_bot()
+
+    mock_broker.get_order_by_client_id.assert_called_once_with(client_id('buy'))
+    mock_broker.submit_order.assert_called_once()
+    mock_handler.fetch_data.assert_called_once()
+
+
+@patch('live_main.send_alert')
+@patch('live_main.AlpacaBroker')
+@patch('live_main.DataHandler')
+@patch('live_main.MACrossoverStrategy')
+def test_restart_resumes_from_checkpointed_signal(mock_strategy_class, mock_handler_class, mock_broker_class, mock_send_alert):
+    """After a skipped run the signal is reused instead of refetching market data."""
+    mock_broker = mock_broker_class.return_value
+    mock_broker.get_last_price.return_value = 100.0
+    mock_broker.get_position.return_value = 10.0
+    mock_broker.is_market_open.return_value = True
+    mock_broker.get_portfolio_value.return_value = 10000.0
+    mock_broker.get_initial_equity.return_value = 10000.0
+    mock_handler = mock_handler_class.return_value
+    mock_handler.fetch_data.return_value = pd.DataFrame()
+    mock_strategy = mock_strategy_class.return_value
+    mock_strategy.generate_signals.return_value = make_signals(1.0)
+
+    run_live_bot()
+    mock_broker.is_market_open.return_value = False
+    run_live_bot()
+
+    mock_handler.fetch_data.assert_called_once()
+    mock_broker.submit_order.assert_not_called()
+
+
+# ==========================================
+# RISK TESTS
+# ==========================================
+
+@patch('live_main.send_alert')
+@patch('live_main.AlpacaBroker')
+@patch('live_main.DataHandler')
+@patch('live_main.MACrossoverStrategy')
+def test_stopped_out_position_stays_out_until_a_new_crossover(mock_strategy_class, mock_handler_class, mock_broker_class,
+                                                              mock_send_alert, monkeypatch, mock_journal):
+    """A stop sells even though the signal is still BUY, and the bot stays out over the following weeks."""
+    monkeypatch.setattr('live_main.STOP_LOSS_PCT', 5.0)
+    mock_broker = mock_broker_class.return_value
+    mock_broker.get_last_price.return_value = 100.0
+    mock_broker.get_position.return_value = 10.0
+    mock_broker.get_entry_price.return_value = 100.0   # real fill price
+    mock_broker.get_buying_power.return_value = 10000.0
+    mock_broker.is_market_open.return_value = False
+    mock_broker.has_open_trade.return_value = False
+    mock_broker.get_portfolio_value.return_value = 10000.0
+    mock_broker.get_initial_equity.return_value = 10000.0
+    mock_broker.submit_order.return_value = MagicMock(id='order-456')
+    mock_handler_class.return_value.fetch_data.return_value = pd.DataFrame()
+
+    # a constant BUY signal , a 7% gap down on 2026-10-13 , then a slow recovery
+    dates = pd.bdate_range('2026-08-03', '2026-11-13')
+    close = pd.Series(101.0, index=dates)
+    close[close.index >= '2026-10-13'] = 93.0 + 0.1 * np.arange((close.index >= '2026-10-13').sum())
+    signal = pd.Series(1.0, index=dates)
+    signal['2026-11-10'] = 0.0   # the crossover flips and comes back
+
+    actions = {}
+    for today in pd.bdate_range('2026-10-13', '2026-11-13'):
+        pin_today(monkeypatch, today.strftime('%Y-%m-%d'))
+        # the download window slides with the run date and ends the session before today
+        window = slice(today - pd.Timedelta(days=60), today - pd.Timedelta(days=1))
+        mock_strategy_class.return_value.generate_signals.return_value = pd.DataFrame(
+            {'Close': close[window], 'Signal': signal[window]})
+        run_live_bot()
+        actions[today.strftime('%Y-%m-%d')] = mock_journal.record_decision.call_args[1]['action']
+        if actions[today.strftime('%Y-%m-%d')] == 'sell':
+            mock_broker.get_position.return_value = 0.0
+            mock_broker.get_entry_price.return_value = None
+
+    # hit at the 10-13 close (seen on the 10-14 run) , acted on at the next bar like the backtest
+    assert actions['2026-10-14'] == 'hold'
+    assert actions['2026-10-15'] == 'sell'
+    # the signal stays BUY for weeks , but the stop holds
+    stayed_out = [day for day in actions if '2026-10-16' <= day <= '2026-11-11']
+    assert len(stayed_out) == 19
+    assert all(actions[day] == 'stopped_out' for day in stayed_out)
+    # 11-10 SELL signal is the target on the 11-12 run (yesterday's signal) , the next BUY is a new crossover
+    assert actions['2026-11-12'] == 'hold'
+    assert actions['2026-11-13'] == 'buy'
+    assert mock_broker.submit_order.call_count == 2
+
+
+@pytest.mark.parametrize("shares, sold", [(15.0, True), (0.0, False)])
+@patch('live_main.send_alert')
+@patch('live_main.AlpacaBroker')
+@patch('live_main.DataHandler')
+@patch('live_main.MACrossoverStrategy')
+def test_drawdown_halt_liquidates_like_the_backtest(mock_strategy_class, mock_handler_class, mock_broker_class,
+                                                    mock_send_alert, shares, sold, monkeypatch, mock_journal):
+    """Past the drawdown limit the backtest goes to zero exposure , so the live bot sells and buys nothing."""
+    monkeypatch.setattr('live_main.MAX_DRAWDOWN_PCT', 10.0)
+    mock_broker = mock_broker_class.return_value
+    mock_broker.get_last_price.return_value = 100.0
+    mock_broker.get_position.return_value = shares
+    mock_broker.get_buying_power.return_value = 10000.0
+    mock_broker.is_market_open.return_value = False
+    mock_broker.has_open_trade.return_value = False
+    # 16.7% below the 1-year peak , but no big loss today
+    mock_broker.get_equity_peak.return_value = 12000.0
+    mock_broker.get_portfolio_value.return_value = 10000.0
+    mock_broker.get_initial_equity.return_value = 10000.0
+    mock_broker.submit_order.return_value = MagicMock(id='order-456')
+    mock_handler_class.return_value.fetch_data.return_value = pd.DataFrame()
+    mock_strategy_class.return_value.generate_signals.return_value = make_signals(1.0)
+
+    run_live_bot()
+
+    if sold:
+        mock_broker.submit_order.assert_called_once_with('SPY', 15.0, 'sell', client_order_id=client_id('sell'))
+    else:
+        mock_broker.submit_order.assert_not_called()
+    assert mock_journal.record_decision.call_args[1]['halted'] is True
+
+
+# ==========================================
+# CONCURRENCY TESTS
+# ==========================================
+
+def slow(value, delay):
+    """Fake dependency call that takes `delay` seconds and returns `value`."""
+    import time
+    def call(*args, **kwargs):
+        time.sleep(delay)
+        return value
+    return call
+
+
+@patch('live_main.send_alert')
+@patch('live_main.AlpacaBroker')
+@patch('live_main.DataHandler')
+@patch('live_main.MACrossoverStrategy')
+def test_data_fetch_and_broker_calls_overlap(mock_strategy_class, mock_handler_class, mock_broker_class, mock_send_alert):
+    """End-to-end input latency should be close to the slowest dependency, not the sum of all of them."""
+    import time
+    mock_broker = MagicMock()
+    mock_broker_class.side_effect = slow(mock_broker, 0.2)
+    mock_broker.get_last_price.side_effect = slow(100.0, 0.2)
+    mock_broker.get_position.side_effect = slow(10.0, 0.2)
+    mock_broker.is_market_open.side_effect = slow(False, 0.2)
+    mock_broker.get_portfolio_value.side_effect = slow(10000.0, 0.2)
+    mock_broker.get_initial_equity.return_value = 10000.0
+    mock_handler = mock_handler_class.return_value
+    mock_handler.fetch_data.side_effect = slow(pd.DataFrame(), 0.5)
+    mock_strategy = mock_strategy_class.return_value
+    mock_strategy.generate_signals.return_value = make_signals(1.0)
+
+    started = time.perf_counter()
+    run_live_bot()
+    elapsed = time.perf_counter() - started
+
+    # sequential would be 0.5 + 0.2 * 5 = 1.5s , the slowest chain is max(0.5 fetch , 0.2 connect + 0.2 snapshot)
+    assert elapsed < 0.8
+    mock_broker.submit_order.assert_not_called()
+
+
+@patch('live_main.send_alert')
+@patch('live_main.AlpacaBroker')
+@patch('live_main.DataHandler')
+@patch('live_main.MACrossoverStrategy')
+def test_cprofile_run_records_the_threaded_fetch(mock_strategy_class, mock_handler_class, mock_broker_class,
+                                                 mock_send_alert, monkeypatch, tmp_path):
+    """With ALGO_PROFILE=cprofile the fetch, which runs in a worker thread, must show up in the profile."""
+    import os
+    import pstats
+    from live_main import profile_run
+    monkeypatch.setenv("ALGO_PROFILE", "cprofile")
+    monkeypatch.setenv("ALGO_PROFILE_DIR", str(tmp_path / 'profiles'))
+    mock_broker = mock_broker_class.return_value
+    mock_broker.get_last_price.return_value = 100.0
+    mock_broker.get_position.return_value = 10.0
+    mock_broker.is_market_open.return_value = False
+    mock_broker.get_portfolio_value.return_value = 10000.0
+    mock_broker.get_initial_equity.return_value = 10000.0
+    mock_handler_class.return_value.fetch_data.return_value = pd.DataFrame()
+    mock_strategy_class.return_value.generate_signals.return_value = make_signals(1.0)
+
+    with profile_run('live'):
+        run_live_bot()
+
+    prof = [f for f in os.listdir(tmp_path / 'profiles') if f.endswith('.prof')][0]
+    functions = {name for _, _, name in pstats.Stats(str(tmp_path / 'profiles' / prof)).stats}
+    assert '_fetch_signals' in functions
@@ -0,0 +1,43 @@
+import pytest
+import pandas as pd
+import numpy as np
+from src.strategy import MACrossoverStrategy
+from src.portfolio import Portfolio
+from src.montecarlo import MonteCarloEngine, _batched_backtest
+from tests.conftest import gbm_frame
+
+def test_batched_backtest_matches_portfolio():
+    # The 2-D engine must reproduce the event-driven ledger on a single path
+    data = gbm_frame()
+    strategy = MACrossoverStrategy(short_window=20, long_window=50)
+    results = Portfolio(10000.0).backtest(strategy.generate_signals(data))
+
+    batched = _batched_backtest(data['Close'].values[None, :], 20, 50, 10000.0, 0.001)
+
+    expected_return = (results['Total'].iloc[-1] - 10000.0) / 10000.0 * 100
+    expected_trades = (results['Shares'].diff().fillna(0) != 0).sum()
+    assert batched['Total Return %'].iloc[0] == pytest.approx(expected_return)
+    assert batched['Trades'].iloc[0] == expected_trades
+
+def test_monte_carlo_is_reproducible_and_chunked():
+    data = gbm_frame()
+    strategy = MACrossoverStrategy(short_window=20, long_window=50)
+    engine = MonteCarloEngine(strategy, Portfolio(10000.0), n_paths=30, chunk_size=7, seed=42)
+
+    first = engine.run(data)
+    second = engine.run(data)
+
+    assert len(first) == 30
+    assert list(first.columns) == ['Total Return %', 'Max Drawdown %', 'Trades']
+    assert (first['Max Drawdown %'] <= 0).all()
+    pd.testing.assert_frame_equal(first, second)
+
+def test_monte_carlo_rejects_unknown_method():
+    with pytest.raises(ValueError, match="Unknown resampling method"):
+        MonteCarloEngine(MACrossoverStrategy(), Portfolio(), method='magic')
+
+def test_monte_carlo_rejects_risk_rules():
+    # the batched ledger has no stops or sizing , so it must not pretend to apply them
+    from src.risk import RiskManager
+    with pytest.raises(ValueError, match="Risk rules"):
+        MonteCarloEngine(MACrossoverStrategy(), Portfolio(risk=RiskManager(stop_loss_pct=5.0)))
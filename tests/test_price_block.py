@@ -0,0 +1,51 @@
+import pytest
+import tracemalloc
+import pandas as pd
+import numpy as np
+from src.price_block import PriceBlock
+from src.strategy import MACrossoverStrategy
+from src.portfolio import Portfolio
+from tests.conftest import gbm_frame
+
+def test_block_is_read_only():
+    block = PriceBlock.from_frame(gbm_frame(days=500, columns=("Open", "Close")))
+    with pytest.raises(ValueError):
+        block['Close'][0] = 1.0
+
+def test_stages_share_input_columns():
+    # Each stage adds its own columns , the input columns are never copied
+    block = PriceBlock.from_frame(gbm_frame(days=500, columns=("Open", "Close")))
+    signals = MACrossoverStrategy(short_window=20, long_window=50).generate_signals(block)
+    results = Portfolio(10000.0).backtest(signals)
+
+    assert np.shares_memory(results['Close'], block['Close'])
+    assert np.shares_memory(results['Signal'], signals['Signal'])
+    assert 'Signal' not in block
+    assert results.columns == ['Open', 'Close', 'SMA_Short', 'SMA_Long', 'Signal', 'Position', 'Cash', 'Shares', 'Total']
+
+def test_block_pipeline_matches_dataframe_pipeline():
+    data = gbm_frame(days=500, columns=("Open", "Close"))
+    strategy = MACrossoverStrategy(short_window=20, long_window=50)
+    from_frame = Portfolio(10000.0).backtest(strategy.generate_signals(data))
+    from_block = Portfolio(10000.0).backtest(strategy.generate_signals(PriceBlock.from_frame(data)))
+
+    pd.testing.assert_frame_equal(from_block.to_frame(), from_frame)
+
+def test_block_pipeline_uses_less_memory():
+    data = gbm_frame(days=100000, columns=("Open", "Close"))
+
+    def peak(raw):
+        tracemalloc.start()
+        signals = MACrossoverStrategy(short_window=20, long_window=50).generate_signals(raw)
+        results = Portfolio(10000.0).backtest(signals)
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return peak_bytes
+
+    block = PriceBlock.from_frame(data)
+    assert peak(block) < 0.5 * peak(data)
+
+def test_block_rejects_misaligned_column():
+    block = PriceBlock.from_frame(gbm_frame(days=10, columns=("Open", "Close")))
+    with pytest.raises(ValueError, match="expected 10"):
+        block.with_columns(Signal=np.zeros(5))
@@ -0,0 +1,63 @@
+import os
+import pytest
+import src.profiling
+from src.profiling import Profiler, profile_run, stage
+
+def busy_work():
+    return sum(i * i for i in range(200000))
+
+def test_profiling_is_noop_when_disabled(monkeypatch, tmp_path):
+    monkeypatch.delenv("ALGO_PROFILE", raising=False)
+    monkeypatch.setenv("ALGO_PROFILE_DIR", str(tmp_path))
+
+    with profile_run('backtest'):
+        # the same shared no-op object every time , nothing is allocated or recorded
+        assert stage('fetch') is stage('signal')
+        busy_work()
+
+    assert os.listdir(tmp_path) == []
+
+def test_profiling_writes_folded_stacks_and_stage_report(tmp_path):
+    with Profiler('backtest', ['sample', 'memory', 'cprofile'], output_dir=str(tmp_path), interval=0.001) as profiler:
+        with stage('fetch'):
+            with stage('clean'):
+                data = [0.0] * 100000
+        with stage('signal'):
+            busy_work()
+
+    files = os.listdir(tmp_path)
+    assert any(f.endswith('.prof') for f in files)
+    assert [r['stage'] for r in profiler.stages] == ['fetch/clean', 'fetch', 'signal']
+    # the nested peak is folded back into the outer stage
+    assert profiler.stages[1]['peak_bytes'] >= profiler.stages[0]['peak_bytes'] > 0
+
+    folded = [f for f in files if f.endswith('.folded')][0]
+    with open(tmp_path / folded) as f:
+        lines = f.read().splitlines()
+    # collapsed stack format: "frame;frame;frame count"
+    assert all(line.rsplit(' ', 1)[1].isdigit() for line in lines)
+    assert any(line.startswith('stage:signal;') for line in lines)
+    assert src.profiling._active is None
+
+def test_profiler_rejects_unknown_mode(tmp_path):
+    with pytest.raises(ValueError, match="Unknown profiling mode"):
+        Profiler('backtest', ['perf'], output_dir=str(tmp_path))
+
+def test_cprofile_includes_worker_threads(tmp_path):
+    # cProfile only follows the thread that enabled it , profile_thread() covers asyncio.to_thread workers
+    import asyncio
+    import pstats
+    from src.profiling import profile_thread
+
+    def worker_only_work():
+        return busy_work()
+
+    async def run_in_worker():
+        return await asyncio.to_thread(profile_thread(worker_only_work))
+
+    with Profiler('live', ['cprofile'], output_dir=str(tmp_path)):
+        asyncio.run(run_in_worker())
+
+    prof = [f for f in os.listdir(tmp_path) if f.endswith('.prof')][0]
+    functions = {name for _, _, name in pstats.Stats(str(tmp_path / prof)).stats}
+    assert 'worker_only_work' in functions
@@ -0,0 +1,138 @@
+import os
+import pytest
+import pandas as pd
+import numpy as np
+from unittest.mock import patch
+from src.price_block import PriceBlock
+from src.strategy import MACrossoverStrategy
+from src.portfolio import Portfolio
+from src.risk import RiskManager
+from src.result_cache import ResultCache
+from tests.conftest import gbm_frame
+
+def test_cached_result_matches_fresh_backtest(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    data = gbm_frame()
+    strategy = MACrossoverStrategy(short_window=10, long_window=30)
+    portfolio = Portfolio(10000.0)
+
+    fresh, fresh_metrics = cache.backtest(data, strategy, portfolio)
+    # the second run must not recompute anything
+    with patch.object(Portfolio, 'backtest', side_effect=AssertionError("recomputed")):
+        cached, cached_metrics = cache.backtest(data, strategy, portfolio)
+
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cached_metrics == fresh_metrics
+    pd.testing.assert_frame_equal(cached, fresh, check_freq=False)
+    assert fresh_metrics['Final Value'] == fresh['Total'].iloc[-1]
+
+def test_cache_returns_price_blocks(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    block = PriceBlock.from_frame(gbm_frame())
+    strategy = MACrossoverStrategy(short_window=10, long_window=30)
+    fresh, _ = cache.backtest(block, strategy, Portfolio(10000.0))
+    cached, _ = cache.backtest(block, strategy, Portfolio(10000.0))
+
+    assert isinstance(cached, PriceBlock)
+    assert cached.columns == fresh.columns
+    np.testing.assert_array_equal(cached['Total'], fresh['Total'])
+
+def test_key_changes_with_every_input(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    data = gbm_frame()
+    base = cache.key(data, MACrossoverStrategy(10, 30), Portfolio(10000.0))
+
+    # same inputs , different objects -> same key
+    assert cache.key(data.copy(), MACrossoverStrategy(10, 30), Portfolio(10000.0)) == base
+
+    changed = data.copy()
+    changed.iloc[-1, 0] += 0.01
+    assert cache.key(changed, MACrossoverStrategy(10, 30), Portfolio(10000.0)) != base
+    assert cache.key(data, MACrossoverStrategy(10, 31), Portfolio(10000.0)) != base
+    assert cache.key(data, MACrossoverStrategy(10, 30, ma_type='ema'), Portfolio(10000.0)) != base
+    assert cache.key(data, MACrossoverStrategy(10, 30), Portfolio(10000.0, fee_pct=0.002)) != base
+    assert cache.key(data, MACrossoverStrategy(10, 30), Portfolio(20000.0)) != base
+    assert cache.key(data, MACrossoverStrategy(10, 30),
+                     Portfolio(10000.0, risk=RiskManager(stop_loss_pct=5.0))) != base
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    data = gbm_frame()
+    portfolio = Portfolio(10000.0)
+    cache = ResultCache(str(tmp_path))
+    cache.backtest(data, MACrossoverStrategy(10, 30), portfolio)
+    entry_size = os.path.getsize(tmp_path / os.listdir(tmp_path)[0])
+
+    # room for two entries
+    cache = ResultCache(str(tmp_path), max_bytes=int(entry_size * 2.5))
+    first = cache.key(data, MACrossoverStrategy(10, 30), portfolio)
+    second = cache.key(data, MACrossoverStrategy(10, 40), portfolio)
+    third = cache.key(data, MACrossoverStrategy(10, 50), portfolio)
+    cache.backtest(data, MACrossoverStrategy(10, 40), portfolio)
+    # make the order of use unambiguous on coarse file system clocks
+    os.utime(tmp_path / f"{first}.npz", ns=(1, 1))
+    os.utime(tmp_path / f"{second}.npz", ns=(2, 2))
+    assert cache.get(first) is not None   # now the most recently used
+
+    cache.backtest(data, MACrossoverStrategy(10, 50), portfolio)
+    assert sorted(os.listdir(tmp_path)) == sorted([f"{first}.npz", f"{third}.npz"])
+
+def test_unreadable_entry_is_recomputed(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    data = gbm_frame()
+    strategy = MACrossoverStrategy(10, 30)
+    key = cache.key(data, strategy, Portfolio(10000.0))
+    (tmp_path / f"{key}.npz").write_bytes(b"not a zip file")
+
+    cache.backtest(data, strategy, Portfolio(10000.0))
+    assert cache.misses == 1
+    assert cache.get(key) is not None
+
+def test_code_changes_give_new_keys(tmp_path, monkeypatch):
+    # editing an indicator or the ledger must not serve results computed by the old code
+    import inspect
+    import src.result_cache
+    cache = ResultCache(str(tmp_path))
+    data = gbm_frame()
+    base = cache.key(data, MACrossoverStrategy(10, 30), Portfolio(10000.0))
+
+    get_source = inspect.getsource
+    for module_name in ('src.indicators', 'src.portfolio', 'src.strategy', 'src.risk'):
+        src.result_cache._module_digest.cache_clear()
+        monkeypatch.setattr(src.result_cache.inspect, 'getsource', lambda module, name=module_name:
+                            get_source(module) + ('\n# edited' if module.__name__ == name else ''))
+        assert cache.key(data, MACrossoverStrategy(10, 30), Portfolio(10000.0)) != base
+    monkeypatch.undo()
+    src.result_cache._module_digest.cache_clear()
+    assert cache.key(data, MACrossoverStrategy(10, 30), Portfolio(10000.0)) == base
+
+def test_entries_deleted_by_another_run_are_skipped(tmp_path):
+    # another run sharing the directory can delete entries between our listing and our own delete
+    cache = ResultCache(str(tmp_path), max_bytes=0)
+    listdir = os.listdir
+    with patch('src.result_cache.os.listdir', lambda path: listdir(path) + ['vanished.npz']), \
+         patch('src.result_cache.os.remove', side_effect=FileNotFoundError):
+        cache.put('a' * 64, {'Total': np.ones(3)}, {})
+
+    cache = ResultCache(str(tmp_path))
+    with patch('src.result_cache.os.utime', side_effect=FileNotFoundError):
+        assert cache.get('a' * 64) is not None
+
+def test_failed_cache_write_keeps_the_result(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    data = gbm_frame()
+    with patch('src.result_cache.os.replace', side_effect=FileNotFoundError("lost race")):
+        results, metrics = cache.backtest(data, MACrossoverStrategy(10, 30), Portfolio(10000.0))
+    assert metrics['Final Value'] == results['Total'].iloc[-1]
+
+def test_concurrent_writers_use_their_own_temp_files(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    opened = []
+    real_open = open
+    def recording_open(path, *args, **kwargs):
+        opened.append(path)
+        return real_open(path, *args, **kwargs)
+    with patch('builtins.open', recording_open):
+        cache.put('a' * 64, {'Total': np.ones(3)}, {})
+        cache.put('a' * 64, {'Total': np.ones(3)}, {})
+    assert len(set(opened)) == 2
+    assert os.listdir(tmp_path) == ['a' * 64 + '.npz']
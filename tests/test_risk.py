@@ -0,0 +1,101 @@
+import pytest
+import pandas as pd
+import numpy as np
+from src.risk import RiskManager
+from src.portfolio import Portfolio
+from src.strategy import MACrossoverStrategy
+from tests.conftest import gbm_frame
+
+def make_signals(days=600, seed=1):
+    strategy = MACrossoverStrategy(short_window=10, long_window=40)
+    return strategy.generate_signals(gbm_frame(days, seed, drift=0.0002, vol=0.015))
+
+def test_incremental_matches_vectorized():
+    # Live (one bar at a time) and backtest (whole array) must give the same exposure
+    data = make_signals()
+    close = data['Close'].to_numpy()
+    target = data['Signal'].shift(1).fillna(0).to_numpy()
+    risk = RiskManager(target_vol=0.10, stop_loss_pct=5.0, trailing_stop_pct=8.0)
+
+    batch = risk.apply(close, target)
+    incremental = [risk.update(p, t) for p, t in zip(close, target)]
+
+    assert batch['Stopped'].any()
+    np.testing.assert_allclose(batch['Exposure'], incremental)
+
+def test_saved_position_state_resumes_the_same_path():
+    # Live runs save the stop state each day and restore it the next , the result must not change
+    data = make_signals(days=250)
+    close = data['Close'].to_numpy()
+    target = data['Signal'].shift(1).fillna(0).to_numpy()
+    settings = dict(target_vol=0.10, stop_loss_pct=5.0, trailing_stop_pct=8.0)
+    expected = RiskManager(**settings).apply(close, target)
+    assert expected['Stopped'].any()
+
+    exposure = []
+    state = None
+    for i in range(len(close)):
+        risk = RiskManager(**settings)
+        risk.prime(close[:i])
+        if state is not None:
+            risk.restore_position(state)
+        exposure.append(risk.update(close[i], target[i]))
+        state = risk.position_state()
+
+    np.testing.assert_allclose(exposure, expected['Exposure'])
+
+def test_entry_price_comes_from_the_fill():
+    risk = RiskManager(stop_loss_pct=5.0)
+    risk.prime([100.0, 101.0])
+    risk.set_entry_price(104.0)           # filled above the close
+    assert risk.update(101.0, 1.0) == 1.0  # only 2.9% below the fill , a close-based entry of 101 would be 0%
+    assert risk.update(98.0, 1.0) == 1.0   # 5.8% below the fill , hit
+    assert risk.update(99.0, 1.0) == 0.0   # out from the next bar
+    assert risk.stopped
+    # the stop holds until the target goes out and back in
+    assert risk.update(110.0, 1.0) == 0.0
+    assert risk.update(110.0, 0.0) == 0.0
+    assert risk.update(110.0, 1.0) == 1.0
+
+def test_stop_loss_exits_the_bar_after_the_hit():
+    close = np.array([100.0, 100.0, 94.0, 96.0, 97.0, 97.0])
+    target = np.array([0.0, 1.0, 1.0, 1.0, 0.0, 1.0])
+    risk = RiskManager(stop_loss_pct=5.0)
+
+    result = risk.apply(close, target)
+
+    # entered at 100 , hit at 94 (bar 2) , out from bar 3 , re-entry on the next crossover
+    assert list(result['Exposure']) == [0.0, 1.0, 1.0, 0.0, 0.0, 1.0]
+
+def test_volatility_target_scales_position():
+    data = make_signals()
+    unsized = Portfolio(10000.0).backtest(data)
+    sized = Portfolio(10000.0, risk=RiskManager(target_vol=0.05)).backtest(data)
+
+    invested = sized['Exposure'] > 0
+    assert invested.any()
+    # 5% target vs ~24% realized vol -> only part of the cash is invested
+    assert (sized.loc[invested, 'Exposure'] < 1.0).all()
+    assert (sized.loc[invested, 'Cash'] > 0).all()
+    assert sized['Total'].std() < unsized['Total'].std()
+
+def test_default_risk_matches_plain_backtest():
+    data = make_signals()
+    plain = Portfolio(10000.0).backtest(data)
+    managed = Portfolio(10000.0, risk=RiskManager()).backtest(data)
+    np.testing.assert_array_equal(plain['Total'], managed['Total'])
+
+def test_drawdown_limit_halts_trading():
+    data = pd.DataFrame({
+        'Close': [100.0, 100.0, 80.0, 70.0, 90.0, 100.0],
+        'Signal': [1.0, 1.0, 1.0, 1.0, 1.0, 1.0]
+    })
+    results = Portfolio(1000.0, risk=RiskManager(max_drawdown_pct=15.0)).backtest(data)
+
+    # the 20% drop on day 2 breaches the limit , the position is sold on day 3 and never re-bought
+    assert results['Shares'].iloc[2] > 0
+    assert (results['Shares'].iloc[3:] == 0).all()
+
+def test_risk_manager_rejects_leverage():
+    with pytest.raises(ValueError, match="max_weight"):
+        RiskManager(max_weight=2.0)
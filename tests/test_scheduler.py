@@ -1,5 +1,6 @@
 import pytest
-from scheduler import get_utc_run_time
+from unittest.mock import patch
+from scheduler import get_utc_run_time, trading_job
 import pytz
 from datetime import datetime
 
@@ -12,4 +13,28 @@ def test_utc_run_time_is_valid_format():
 def test_utc_run_time_differs_from_local():
     """UTC run time should differ from Athens local time (UTC is behind Athens)."""
     result = get_utc_run_time()
-    assert result != "22:45"  # UTC should never equal Athens local time
\ No newline at end of file
+    assert result != "22:45"  # UTC should never equal Athens local time
+
+@patch('scheduler.run_live_bot')
+@patch('scheduler.get_calendar')
+def test_trading_job_skips_exchange_holidays(mock_get_calendar, mock_run_live_bot):
+    """The bot should not run on a weekday the exchange is closed."""
+    mock_get_calendar.return_value.is_session.return_value = False
+    trading_job()
+    mock_run_live_bot.assert_not_called()
+
+    mock_get_calendar.return_value.is_session.return_value = True
+    trading_job()
+    mock_run_live_bot.assert_called_once()
+
+
+@patch('scheduler.run_live_bot')
+@patch('scheduler.get_calendar')
+def test_trading_job_honours_algo_profile(mock_get_calendar, mock_run_live_bot, monkeypatch, tmp_path):
+    """Scheduled runs are the production live path , ALGO_PROFILE must cover them too."""
+    import os
+    monkeypatch.setenv("ALGO_PROFILE", "cprofile")
+    monkeypatch.setenv("ALGO_PROFILE_DIR", str(tmp_path))
+    mock_get_calendar.return_value.is_session.return_value = True
+    trading_job()
+    assert any(f.startswith('live-') and f.endswith('.prof') for f in os.listdir(tmp_path))
@@ -0,0 +1,45 @@
+import pytest
+from datetime import date
+import pandas as pd
+from src.trading_calendar import TradingCalendar
+
+@pytest.fixture(scope="module")
+def calendar():
+    return TradingCalendar(start_year=2018, end_year=2027)
+
+def test_session_counts_match_nyse(calendar):
+    # Published NYSE session counts , 2018 includes the Bush funeral closure
+    assert calendar.sessions_between('2018-01-01', '2018-12-31') == 251
+    assert calendar.sessions_between('2023-01-01', '2023-12-31') == 250
+    assert calendar.sessions_between('2024-01-01', '2024-12-31') == 252
+
+def test_holidays_and_observed_days(calendar):
+    assert not calendar.is_session('2024-03-29')   # Good Friday
+    assert not calendar.is_session('2022-12-26')   # Christmas on Sunday -> observed Monday
+    assert not calendar.is_session('2026-07-03')   # July 4th on Saturday -> observed Friday
+    assert not calendar.is_session('2023-06-19')   # Juneteenth
+    assert calendar.is_session('2021-12-31')       # New Year's on Saturday is not moved back
+    assert not calendar.is_session('2024-06-15')   # Saturday
+
+def test_early_close_times(calendar):
+    # Day after Thanksgiving closes at 13:00 New York time (18:00 UTC in winter)
+    session_open, session_close = calendar.next_session(pd.Timestamp('2026-11-26 12:00', tz='UTC'))
+    assert calendar.is_early_close('2026-11-27')
+    assert session_open == pd.Timestamp('2026-11-27 14:30', tz='UTC')
+    assert session_close == pd.Timestamp('2026-11-27 18:00', tz='UTC')
+
+def test_last_completed_session(calendar):
+    # Monday 2026-10-19 closes at 20:00 UTC (16:00 EDT)
+    assert calendar.last_completed_session('2026-10-19 19:59') == date(2026, 10, 16)
+    assert calendar.last_completed_session('2026-10-19 20:00') == date(2026, 10, 19)
+    # Saturday still points at Friday
+    assert calendar.last_completed_session('2026-10-24 12:00') == date(2026, 10, 23)
+
+def test_sessions_between_handles_weekends(calendar):
+    assert calendar.sessions_between('2026-10-16', '2026-10-19') == 2
+    assert calendar.sessions_between('2026-10-17', '2026-10-18') == 0
+    assert calendar.sessions_between('2026-10-20', '2026-10-19') == 0
+
+def test_outside_range_raises(calendar):
+    with pytest.raises(ValueError, match="outside the precomputed calendar"):
+        calendar.next_session('2030-06-01')